@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Country and state boundary layers shared by the maps.
+
+The boundary files are read and parsed once per process.  Every layer is
+also offered simplified with the Douglas-Peucker algorithm so a small map or
+a zoomed out view can draw fewer points
+
+    tolerance   0      the boundaries as stored
+                0.05   ( Decimal Degrees ) detailed maps
+                0.1    world maps
+                0.25   small or overview maps
+
+A GeoJSONDataSource is made once per layer and tolerance and handed to every
+map.  Bokeh only lets a data source belong to one document, so once a shared
+source is used by a rendered map the next map receives a new source made from
+the cached GeoJSON text.
+
+@author: Derek Holsapple
+"""
+
+import os
+import json
+import numpy as np
+import bokeh.models as bkm
+
+
+
+class boundaryLayers:
+
+    # Boundary files of the layers in \Map
+    layerFiles = { 'countries' : 'countries.geojson' ,
+                   'states' : 'us-states.json' }
+    # Precomputed simplification tolerances ( Decimal Degrees ), 0 is not simplified
+    tolerances = ( 0 , 0.05 , 0.1 , 0.25 )
+
+    # Parsed boundary files, path : GeoJSON dictionary
+    parsedLayers = {}
+    # GeoJSON text, ( path , tolerance ) : String
+    layerText = {}
+    # Shared data sources, ( path , tolerance ) : GeoJSONDataSource
+    dataSources = {}
+
+
+
+    def layerPath( path , layer ):
+        '''
+        HELPER FUNCTION
+
+        layerPath()
+
+        @param path        -String, of the current working directory
+        @param layer       -String, 'countries' or 'states'
+
+        @return            -String, path of the boundary file
+        '''
+        return os.path.abspath( path + "/Map/" + boundaryLayers.layerFiles[ layer ] )
+
+
+
+    def douglasPeucker( points , tolerance ):
+        '''
+        HELPER FUNCTION
+
+        douglasPeucker()
+
+        Simplify a line with the Douglas-Peucker algorithm.  A point is kept
+        when it is farther than the tolerance from the segment between the
+        points kept around it.
+
+        @param points      -numpy array, ( points , 2 ) Lon/Lat of the line
+        @param tolerance   -float, largest distance a removed point may be
+                                    from the simplified line ( Decimal Degrees )
+
+        @return            -numpy array, ( kept points , 2 ) simplified line
+        '''
+        if len( points ) < 3:
+            return points
+        keep = np.zeros( len( points ) , dtype = bool )
+        keep[0] = keep[-1] = True
+        # Segments still to be checked, ( first , last ) point of the segment
+        stack = [ ( 0 , len( points ) - 1 ) ]
+        while stack:
+            first , last = stack.pop()
+            if last - first < 2:
+                continue
+            start = points[ first ]
+            segment = points[ last ] - start
+            offsets = points[ first + 1 : last ] - start
+            length = np.hypot( segment[0] , segment[1] )
+            if length == 0:
+                # Closed ring, the distance to the start point
+                distances = np.hypot( offsets[ : , 0 ] , offsets[ : , 1 ] )
+            else:
+                distances = np.abs( segment[0] * offsets[ : , 1 ] - segment[1] * offsets[ : , 0 ] ) / length
+            farthest = int( np.argmax( distances ) )
+            if distances[ farthest ] > tolerance:
+                farthest = farthest + first + 1
+                keep[ farthest ] = True
+                stack.append( ( first , farthest ) )
+                stack.append( ( farthest , last ) )
+        return points[ keep ]
+
+
+
+    def simplifyRing( ring , tolerance ):
+        '''
+        HELPER FUNCTION
+
+        simplifyRing()
+
+        Simplify one ring of a polygon.  Rings that would fall below a
+        triangle are kept as stored.
+
+        @param ring        -List, [ lon , lat ] points of the ring
+        @param tolerance   -float, see douglasPeucker()
+
+        @return            -List, [ lon , lat ] points of the simplified ring
+        '''
+        simplified = boundaryLayers.douglasPeucker( np.asarray( ring , dtype = np.float64 ) , tolerance )
+        if len( simplified ) < 4:
+            return ring
+        return simplified.tolist()
+
+
+
+    def simplifyLayer( geojson , tolerance ):
+        '''
+        HELPER FUNCTION
+
+        simplifyLayer()
+
+        Simplify every Polygon and MultiPolygon of a FeatureCollection, other
+        geometries are kept as stored
+
+        @param geojson     -Dictionary, parsed GeoJSON FeatureCollection
+        @param tolerance   -float, see douglasPeucker()
+
+        @return            -Dictionary, simplified FeatureCollection
+        '''
+        features = []
+        for feature in geojson['features']:
+            geometry = feature['geometry']
+            if geometry['type'] == 'Polygon':
+                coordinates = [ boundaryLayers.simplifyRing( ring , tolerance )
+                                for ring in geometry['coordinates'] ]
+            elif geometry['type'] == 'MultiPolygon':
+                coordinates = [ [ boundaryLayers.simplifyRing( ring , tolerance ) for ring in polygon ]
+                                for polygon in geometry['coordinates'] ]
+            else:
+                coordinates = geometry['coordinates']
+            features.append( dict( feature ,
+                                   geometry = dict( geometry , coordinates = coordinates ) ) )
+        return dict( geojson , features = features )
+
+
+
+    def geojsonText( path , layer , tolerance = 0 ):
+        '''
+        HELPER FUNCTION
+
+        geojsonText()
+
+        GeoJSON text of a layer, the file is read once and every tolerance is
+        simplified once per process
+
+        @param path        -String, of the current working directory
+        @param layer       -String, 'countries' or 'states'
+        @param tolerance   -float, see douglasPeucker(), 0 is not simplified
+
+        @return            -String, GeoJSON of the layer
+        '''
+        layerFile = boundaryLayers.layerPath( path , layer )
+        key = ( layerFile , tolerance )
+        if key not in boundaryLayers.layerText:
+            if layerFile not in boundaryLayers.parsedLayers:
+                with open( layerFile , "r" ) as f:
+                    text = f.read()
+                boundaryLayers.parsedLayers[ layerFile ] = json.loads( text )
+                boundaryLayers.layerText[ ( layerFile , 0 ) ] = text
+            if tolerance != 0:
+                simplified = boundaryLayers.simplifyLayer( boundaryLayers.parsedLayers[ layerFile ] , tolerance )
+                boundaryLayers.layerText[ key ] = json.dumps( simplified , separators = ( ',' , ':' ) )
+        return boundaryLayers.layerText[ key ]
+
+
+
+    def dataSource( path , layer , tolerance = 0 ):
+        '''
+        EXECUTION FUNCTION
+
+        dataSource()
+
+        Shared GeoJSONDataSource of a boundary layer
+
+        @param path        -String, of the current working directory
+        @param layer       -String, 'countries' or 'states'
+        @param tolerance   -float, see douglasPeucker(), 0 is not simplified
+
+        @return            -GeoJSONDataSource, of the layer
+        '''
+        key = ( boundaryLayers.layerPath( path , layer ) , tolerance )
+        source = boundaryLayers.dataSources.get( key )
+        # A source already used by a rendered map can not join another document
+        if source is None or source.document is not None:
+            source = bkm.GeoJSONDataSource( geojson = boundaryLayers.geojsonText( path , layer , tolerance ) )
+            boundaryLayers.dataSources[ key ] = source
+        return source
+
+
+
+    def toleranceForWidth( width , lonSpan = 360 ):
+        '''
+        HELPER FUNCTION
+
+        toleranceForWidth()
+
+        Largest precomputed tolerance that is still below one pixel of a map
+
+        @param width       -int, width of the map in pixels
+        @param lonSpan     -float, Decimal Degrees of longitude shown across
+                                    the map
+
+        @return            -float, one of boundaryLayers.tolerances
+        '''
+        pixel = lonSpan / float( width )
+        return max( tolerance for tolerance in boundaryLayers.tolerances if tolerance <= pixel )
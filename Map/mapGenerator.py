@@ -14,11 +14,16 @@ import bokeh.models as bkm
 import bokeh.plotting as bkp
 from bokeh.models import LogTicker, ColorBar
 
+#For XLwings ref
+from Processing.summaryGrid import summaryGrid
+from Map.boundaryLayers import boundaryLayers
+
 
 class mapGenerator:
 
     def mapGenerator(path , mapSelect , htmlString , title, 
-                     scaleMin, scaleMax, metric):
+                     scaleMin, scaleMax, metric, gridResolution = None, gridMethod = 'nearest',
+                     maxDistance = summaryGrid.mapMaxDistance):
         '''
         HELPER FUNCTION
         
@@ -56,6 +61,14 @@ class mapGenerator:
         @param scaleMin   - Float,  minimum value of the scale
         @param scaleMax   - Float,  maximum value of the scale        
         @param metric     - String, metric of the value being measured        
+        @param gridResolution - Float, cell size (Decimal Degrees) of the gridded
+                                    layer drawn instead of a circle per site, 
+                                    None draws the circles
+        @param gridMethod     - String, 'nearest', 'idw' or 'kriging' see
+                                    summaryGrid.createSummaryGrids()
+        @param maxDistance    - Float, grid cells farther than this from every
+                                    site are not drawn (km), None draws 
+                                    every cell ( open ocean included )
         
         @return           -void, Bokeh map as a html
         '''    
@@ -69,10 +82,11 @@ class mapGenerator:
         
         #Access the .json file to create the map of countries and states
         # The json files will create layers to overlap the data with
-        with open(path + "/Map/countries.geojson", "r") as f:
-            countries = bkm.GeoJSONDataSource(geojson=f.read())  
-        with open(path + "/Map/us-states.json", "r") as f:
-            states = bkm.GeoJSONDataSource(geojson=f.read())              
+        # The layers are parsed once per process, the boundaries are simplified 
+        #     below one pixel of the 1500 pixel wide map
+        tolerance = boundaryLayers.toleranceForWidth(1500)
+        countries = boundaryLayers.dataSource(path, 'countries', tolerance)
+        states = boundaryLayers.dataSource(path, 'states', tolerance)              
         #Access the processed summary data pickle
         level_1_df = pd.read_pickle(path + "\\Pandas_Pickle_DataFrames\\Pickle_Level1_Summary\\Pickle_Level1_Summary.pickle")
         
@@ -126,16 +140,29 @@ class mapGenerator:
         p.y_range = bkm.Range1d(start=-90, end=90)
     
     
-        #Create the datapoints as overlapping circles
-        p.circle("Lon",
-                 "Lat", 
-                 source= source , 
-                 radius="radius" , 
-                 #fill color will use linear_cmap() to scale the colors of the circles being displayed
-                 fill_color = linear_cmap('selector', colorSelector, low = scaleMin, high = scaleMax),
-                 line_color =None,  
-                 # Alpha is the transparency of the circle
-                 alpha=0.3)
+        if gridResolution is None:
+            #Create the datapoints as overlapping circles
+            p.circle("Lon",
+                     "Lat", 
+                     source= source , 
+                     radius="radius" , 
+                     #fill color will use linear_cmap() to scale the colors of the circles being displayed
+                     fill_color = linear_cmap('selector', colorSelector, low = scaleMin, high = scaleMax),
+                     line_color =None,  
+                     # Alpha is the transparency of the circle
+                     alpha=0.3)
+        else:
+            #Draw the precomputed grid of the metric as one image, empty cells are transparent
+            lats, lons, grid = summaryGrid.loadSummaryGrid(path, mapSelect, gridResolution,
+                                                           gridMethod, maxDistance)
+            p.image(image = [grid],
+                    x = lons[0] - gridResolution / 2,
+                    y = lats[0] - gridResolution / 2,
+                    dw = len(lons) * gridResolution,
+                    dh = len(lats) * gridResolution,
+                    color_mapper = LinearColorMapper(palette = colorSelector, low = scaleMin, high = scaleMax,
+                                                     nan_color = (0, 0, 0, 0)),
+                    global_alpha = 0.6)
         #Stations will be the black dots displayed on the map
         stations = p.circle("Lon",
                  "Lat", 
@@ -181,7 +208,8 @@ class mapGenerator:
 
 
 
-    def mapGeneratorDriver(path , mapType):
+    def mapGeneratorDriver(path , mapType , gridResolution = None , gridMethod = 'nearest' ,
+                           maxDistance = summaryGrid.mapMaxDistance):
 
         '''
         DRIVER FUNCTION
@@ -212,6 +240,13 @@ class mapGenerator:
             Sum of Yearly Water Vapor Pressure
             Annual Hours Relative Humidity > 85%
             Sum of Yearly Dew
+
+        @param gridResolution - Float, cell size of the gridded layer, None 
+                                    draws a circle per site, see mapGenerator()
+        @param gridMethod     - String, 'nearest', 'idw' or 'kriging'
+        @param maxDistance    - Float, grid cells farther than this from every
+                                    site are not drawn (km), None draws 
+                                    every cell
         '''
         
         if mapType == 'Annual GHI':
@@ -222,7 +257,8 @@ class mapGenerator:
             scaleMax = 8
             metric = "(GJ/m^-2)"
             mapGenerator.mapGenerator(path , mapSelect , htmlString , title, 
-                                      scaleMin, scaleMax , metric)
+                                      scaleMin, scaleMax , metric ,
+                                      gridResolution , gridMethod , maxDistance)
             
         elif mapType == 'Annual DNI':
             title = 'Annual Direct Normal Irradiance (GJ/m^-2)'    
@@ -232,7 +268,8 @@ class mapGenerator:
             scaleMax = 10
             metric = "(GJ/m^-2)"
             mapGenerator.mapGenerator(path , mapSelect , htmlString , title, 
-                                      scaleMin, scaleMax , metric)
+                                      scaleMin, scaleMax , metric ,
+                                      gridResolution , gridMethod , maxDistance)
     
         elif mapType == 'Annual DHI':
             title = 'Annual Diffuse Horizontal Irradiance (GJ/m^-2)'    
@@ -242,7 +279,8 @@ class mapGenerator:
             scaleMax = 4
             metric = "(GJ/m^-2)"
             mapGenerator.mapGenerator(path , mapSelect , htmlString , title, 
-                                      scaleMin, scaleMax , metric)
+                                      scaleMin, scaleMax , metric ,
+                                      gridResolution , gridMethod , maxDistance)
     
         elif mapType == 'Annual POA Global Irradiance':
             title = 'Annual POA Global Irradiance (GJ/m^-2)'    
@@ -252,7 +290,8 @@ class mapGenerator:
             scaleMax = 8
             metric = "(GJ/m^-2)"
             mapGenerator.mapGenerator(path , mapSelect , htmlString , title, 
-                                      scaleMin, scaleMax , metric)
+                                      scaleMin, scaleMax , metric ,
+                                      gridResolution , gridMethod , maxDistance)
 
         elif mapType == 'Annual POA Direct Irradiance':
             title = 'Annual POA Direct Irradiance (GJ/m^-2)'    
@@ -262,7 +301,8 @@ class mapGenerator:
             scaleMax = 8
             metric = "(GJ/m^-2)"
             mapGenerator.mapGenerator(path , mapSelect , htmlString , title, 
-                                      scaleMin, scaleMax , metric)
+                                      scaleMin, scaleMax , metric ,
+                                      gridResolution , gridMethod , maxDistance)
 
         elif mapType == 'Annual POA Diffuse Irradiance':
             title = 'Annual POA Diffuse Irradiance (GJ/m^-2)'    
@@ -272,7 +312,8 @@ class mapGenerator:
             scaleMax = 4
             metric = "(GJ/m^-2)"
             mapGenerator.mapGenerator(path , mapSelect , htmlString , title, 
-                                      scaleMin, scaleMax , metric)
+                                      scaleMin, scaleMax , metric ,
+                                      gridResolution , gridMethod , maxDistance)
             
         elif mapType == 'Annual POA Sky Diffuse Irradiance':
             title = 'Annual POA Sky Diffuse Irradiance (GJ/m^-2)'    
@@ -282,7 +323,8 @@ class mapGenerator:
             scaleMax = 4
             metric = "(GJ/m^-2)"
             mapGenerator.mapGenerator(path , mapSelect , htmlString , title, 
-                                      scaleMin, scaleMax , metric)            
+                                      scaleMin, scaleMax , metric ,
+                                      gridResolution , gridMethod , maxDistance)            
 
         elif mapType == 'Annual POA Ground Diffuse Irradiance':
             title = 'Annual POA Ground Diffuse Irradiance (GJ/m^-2)'    
@@ -292,7 +334,8 @@ class mapGenerator:
             scaleMax = .40
             metric = "(GJ/m^-2)"
             mapGenerator.mapGenerator(path , mapSelect , htmlString , title, 
-                                      scaleMin, scaleMax , metric)            
+                                      scaleMin, scaleMax , metric ,
+                                      gridResolution , gridMethod , maxDistance)            
 
         elif mapType == 'Annual Global UV Dose':
             title = 'Annual Global UV Dose (MJ/y^-1)'    
@@ -302,7 +345,8 @@ class mapGenerator:
             scaleMax = 400
             metric = "(MJ/y^-1)"
             mapGenerator.mapGenerator(path , mapSelect , htmlString , title, 
-                                      scaleMin, scaleMax , metric)            
+                                      scaleMin, scaleMax , metric ,
+                                      gridResolution , gridMethod , maxDistance)            
 
         elif mapType == 'Annual UV Dose at Latitude Tilt':
             title = 'Annual UV Dose at Latitude Tilt (MJ/y^-1)'    
@@ -312,7 +356,8 @@ class mapGenerator:
             scaleMax = 400
             metric = "(MJ/y^-1)"
             mapGenerator.mapGenerator(path , mapSelect , htmlString , title, 
-                                      scaleMin, scaleMax , metric)            
+                                      scaleMin, scaleMax , metric ,
+                                      gridResolution , gridMethod , maxDistance)            
 
         elif mapType == 'Annual Minimum Ambient Temperature':
             title = 'Annual Minimum Ambient Temperature (C)'    
@@ -322,7 +367,8 @@ class mapGenerator:
             scaleMax = 25
             metric = "(C)"
             mapGenerator.mapGenerator(path , mapSelect , htmlString , title, 
-                                      scaleMin, scaleMax , metric) 
+                                      scaleMin, scaleMax , metric ,
+                                      gridResolution , gridMethod , maxDistance) 
 
         elif mapType == 'Annual Average Ambient Temperature':
             title = 'Annual Average Ambient Temperature (C)'    
@@ -332,7 +378,8 @@ class mapGenerator:
             scaleMax = 30
             metric = "(C)"
             mapGenerator.mapGenerator(path , mapSelect , htmlString , title, 
-                                      scaleMin, scaleMax , metric) 
+                                      scaleMin, scaleMax , metric ,
+                                      gridResolution , gridMethod , maxDistance) 
 
         elif mapType == 'Annual Maximum Ambient Temperature':
             title = 'Annual Maximum Ambient Temperature (C)'    
@@ -342,7 +389,8 @@ class mapGenerator:
             scaleMax = 50
             metric = "(C)"
             mapGenerator.mapGenerator(path , mapSelect , htmlString , title, 
-                                      scaleMin, scaleMax , metric) 
+                                      scaleMin, scaleMax , metric ,
+                                      gridResolution , gridMethod , maxDistance) 
 
         elif mapType == 'Annual Range Ambient Temperature':
             title = 'Annual Range Ambient Temperature (C)'    
@@ -352,7 +400,8 @@ class mapGenerator:
             scaleMax = 80
             metric = "(C)"
             mapGenerator.mapGenerator(path , mapSelect , htmlString , title, 
-                                      scaleMin, scaleMax , metric) 
+                                      scaleMin, scaleMax , metric ,
+                                      gridResolution , gridMethod , maxDistance) 
 
         elif mapType == 'Average of Yearly Water Vapor Pressure':
             title = 'Average Yearly Water Vapor Pressure (kPa)'    
@@ -362,7 +411,8 @@ class mapGenerator:
             scaleMax = 3.2
             metric = "(kPa)"
             mapGenerator.mapGenerator(path , mapSelect , htmlString , title, 
-                                      scaleMin, scaleMax , metric)
+                                      scaleMin, scaleMax , metric ,
+                                      gridResolution , gridMethod , maxDistance)
 
         elif mapType == 'Sum of Yearly Water Vapor Pressure':
             title = 'Sum of Yearly Water Vapor Pressure(kPa)'    
@@ -372,7 +422,8 @@ class mapGenerator:
             scaleMax = 25000
             metric = "(kPa)"
             mapGenerator.mapGenerator(path , mapSelect , htmlString , title, 
-                                      scaleMin, scaleMax , metric)
+                                      scaleMin, scaleMax , metric ,
+                                      gridResolution , gridMethod , maxDistance)
 
         elif mapType == 'Annual Hours Relative Humidity > 85%':
             title = 'Annual number of Hours Relative Humidity > to 85%'    
@@ -382,7 +433,8 @@ class mapGenerator:
             scaleMax = 5000
             metric = "(hours)"
             mapGenerator.mapGenerator(path , mapSelect , htmlString , title, 
-                                      scaleMin, scaleMax , metric)
+                                      scaleMin, scaleMax , metric ,
+                                      gridResolution , gridMethod , maxDistance)
 
         elif mapType == 'Sum of Yearly Dew':
             title = 'Sum of Yearly Dew(mmd-1)'    
@@ -392,4 +444,5 @@ class mapGenerator:
             scaleMax = 50
             metric = "(mmd-1)"
             mapGenerator.mapGenerator(path , mapSelect , htmlString , title, 
-                                      scaleMin, scaleMax , metric)
+                                      scaleMin, scaleMax , metric ,
+                                      gridResolution , gridMethod , maxDistance)
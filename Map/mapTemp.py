@@ -30,13 +30,18 @@ import bokeh.models as bkm
 import bokeh.plotting as bkp
 from bokeh.models import LogTicker, ColorBar
 
+#For XLwings ref
+from Processing.summaryGrid import summaryGrid
+from Map.boundaryLayers import boundaryLayers
+
 
 
 class mapTemp:
 
     
     # Rerad the pickle containing the Summary dataframe
-    def outputMapTemp(path , mapSelect):
+    def outputMapTemp(path , mapSelect , gridResolution = None , gridMethod = 'nearest' ,
+                      maxDistance = summaryGrid.mapMaxDistance):
         '''
         EXECUTION METHOD
         
@@ -55,6 +60,14 @@ class mapTemp:
                                        - 'insulated_back_polymerback'
                                        - 'open_rack_polymer_thinfilm_steel'
                                        - '22x_concentrator_tracker'                               
+        @param gridResolution - Float, cell size (Decimal Degrees) of the gridded
+                                    layer drawn instead of a circle per site, 
+                                    None draws the circles
+        @param gridMethod   - String, 'nearest', 'idw' or 'kriging' see
+                                    summaryGrid.createSummaryGrids()
+        @param maxDistance  - Float, grid cells farther than this from every
+                                    site are not drawn (km), None draws 
+                                    every cell ( open ocean included )
         
         @return void        - Generates a html Bokeh map
         '''        
@@ -234,10 +247,11 @@ class mapTemp:
         
         #Access the .json file to create the map of countries and states
         # THe json files will create layers to overlap the data with
-        with open(path + "/Map/countries.geojson", "r") as f:
-            countries = bkm.GeoJSONDataSource(geojson=f.read())  
-        with open(path + "/Map/us-states.json", "r") as f:
-            states = bkm.GeoJSONDataSource(geojson=f.read())      
+        # The layers are parsed once per process, the boundaries are simplified 
+        #     below one pixel of the 1500 pixel wide map
+        tolerance = boundaryLayers.toleranceForWidth(1500)
+        countries = boundaryLayers.dataSource(path, 'countries', tolerance)
+        states = boundaryLayers.dataSource(path, 'states', tolerance)      
         
         #Access the processed summary data pickle
         level_1_df = pd.read_pickle(path + "\\Pandas_Pickle_DataFrames\\Pickle_Level1_Summary\\Pickle_Level1_Summary.pickle")
@@ -302,16 +316,29 @@ class mapTemp:
         p.y_range = bkm.Range1d(start=-90, end=90)
     
     
-        #Create the datapoints as overlapping circles
-        p.circle("Lon",
-                 "Lat", 
-                 source= source , 
-                 radius="radius" , 
-                 #fill color will use linear_cmap() to scale the colors of the circles being displayed
-                 fill_color = linear_cmap('selector', colorSelector, low= mapScaleLower, high= mapScaleUpper),
-                 line_color =None,  
-                 # Alpha is the transparency of the circle
-                 alpha=0.3)
+        if gridResolution is None:
+            #Create the datapoints as overlapping circles
+            p.circle("Lon",
+                     "Lat", 
+                     source= source , 
+                     radius="radius" , 
+                     #fill color will use linear_cmap() to scale the colors of the circles being displayed
+                     fill_color = linear_cmap('selector', colorSelector, low= mapScaleLower, high= mapScaleUpper),
+                     line_color =None,  
+                     # Alpha is the transparency of the circle
+                     alpha=0.3)
+        else:
+            #Draw the precomputed grid of the module temperature as one image, empty cells are transparent
+            lats, lons, grid = summaryGrid.loadSummaryGrid(path, moduleType, gridResolution,
+                                                           gridMethod, maxDistance)
+            p.image(image = [grid],
+                    x = lons[0] - gridResolution / 2,
+                    y = lats[0] - gridResolution / 2,
+                    dw = len(lons) * gridResolution,
+                    dh = len(lats) * gridResolution,
+                    color_mapper = LinearColorMapper(palette = colorSelector, low = mapScaleLower, high = mapScaleUpper,
+                                                     nan_color = (0, 0, 0, 0)),
+                    global_alpha = 0.6)
         #Stations will be the black dots displayed on the map
         stations = p.circle("Lon",
                  "Lat", 
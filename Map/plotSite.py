@@ -13,6 +13,8 @@ Created on Mon Nov  4 08:15:40 2019
 """
 
 from Processing.cleanRawOutput import cleanRawOutput
+from Processing.level1Store import level1Store
+from Processing.siteIndex import siteIndex
 #from cleanRawOutput import cleanRawOutput
 import pandas as pd
 from bokeh.plotting import  output_file, show
@@ -26,7 +28,7 @@ class plotSite:
     
     
     
-    def findPickleFile(fileID , currentDirectory):
+    def findPickleFile(fileID , currentDirectory , columns = None):
         '''
         HELPER FUNCTION
         
@@ -35,28 +37,24 @@ class plotSite:
         @param currentDirectory       -String, where the excel file is located       
         @param fileID                 -String, 6 digit Unique ID of site 
                                                     specific location
+        @param columns                -String List, columns of the level 1 frame
+                                                    to read, None reads every column.
+                                                    Parquet files only read these columns
 
         @return raw_df, summaryRow_df -Series, Site geographic site location data
                                        -Dataframe, Site location hourly data
         '''
         #Set path
         path = currentDirectory
-        # Get the file name of each raw data pickle,  the unique identifier is inside this list
-        rawfileNames = cleanRawOutput.filesNameList( path )
+        # Look up the files and summary row of the site in the site index
+        entry = siteIndex.findSite( path , fileID )
+        if entry is None:
+            raise ValueError( 'Site Identifier Code not found: ' + str( fileID ) )
         # Reference the summary frame to pull out the user Input row and display
         summary_df = cleanRawOutput.dataSummaryFrame( path )
-        #Create a list of unique identifiers for the file string names "See helper functions"
-        uniqueID_List = cleanRawOutput.stringList_UniqueID_List(rawfileNames)
-        booleanSearch = summary_df["Site Identifier Code"].str.find(fileID) 
-        for r in range( 0 , len(booleanSearch)):
-            if booleanSearch[r] == 0:
-                summaryRow_df = summary_df.iloc[r,:]
-                break
-        for i in range(0 , len( rawfileNames ) ):
-            #If the user input is a match with a raw data file
-            if fileID == uniqueID_List[i]:
-                # Pull out the raw pickle of the located file name
-                data_tuple = pd.read_pickle( path + '/Pandas_Pickle_DataFrames/Pickle_Level1/' + rawfileNames[i] )
+        summaryRow_df = summary_df.iloc[ entry['summaryRow'] , : ]
+        # Pull out the level 1 data of the located file name ( pickle or Parquet )
+        data_tuple = level1Store.readLevel1( path , entry['rawFile'] , columns )
         return data_tuple , summaryRow_df
     
     
@@ -87,7 +85,12 @@ class plotSite:
         ''' 
 
         #Access the level_1_df site specific, also collect that sites series data
-        data_tuple , siteLocation_series = plotSite.findPickleFile(fileID , currentDirectory)
+        # Only the plotted column and the time columns are needed
+        data_tuple , siteLocation_series = plotSite.findPickleFile(fileID , currentDirectory ,
+                                                                   [ selector ,
+                                                                     'Local Date Time' ,
+                                                                     'Universal Date Time' ,
+                                                                     'Local Solar Time' ] )
         
         # Unpack the tuple
         site_location , level_1_df = data_tuple
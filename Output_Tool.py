@@ -16,12 +16,17 @@ from Processing.rawDataImport import rawDataImport
 from Processing.finalOutputFrame import finalOutputFrame
 from Processing.cleanRawOutput import cleanRawOutput
 from Processing.closestLatLon import closestLatLon
+from Processing.level1Store import level1Store
+from Processing.hourlyCube import hourlyCube
+from Processing.rawDataExtract import rawDataExtract
+from Processing.siteIndex import siteIndex
+from Processing.summaryGrid import summaryGrid
 from Map.mapTemp import mapTemp
 from Map.plotSite import plotSite
 from Map.mapGenerator import mapGenerator
 
 
-def extractAllZip_Files( path ):
+def extractAllZip_Files( path , incremental = False , workers = None ):
     '''
     XL Wings FUNCTION
     
@@ -35,6 +40,16 @@ def extractAllZip_Files( path ):
                                     unzipping files
                             i.e. the program will extract every sub directory 
                                     beyond this path
+    @param incremental - Boolean, True walks the directories once, only 
+                                    extracts the .csv and .epw files, extracts 
+                                    the archives concurrently and skips the 
+                                    files that are already current.  A file
+                                    name found more than once is extracted 
+                                    from one source and the duplicates are
+                                    counted in the workbook.
+                                    False deletes and re-extracts everything
+    @param workers     - int, number of extraction threads when incremental,
+                                    None uses the default
     @return void       - Program will store extracted files into the 
                                     Python_RawData_Combined directory
     '''
@@ -46,6 +61,17 @@ def extractAllZip_Files( path ):
     mySheet = myWorkBook.sheets[0]
     ##############
     myWorkBook.sheets[mySheet].range(32,4).value = "Unzipping Files"
+    if incremental:
+        # See rawDataExtract.extractRawData()
+        sources , written , duplicates = rawDataExtract.extractRawData( path , workers )
+        myWorkBook.sheets[mySheet].range(34,6).value =  "Total Files"
+        myWorkBook.sheets[mySheet].range(35,6).value =  sources
+        myWorkBook.sheets[mySheet].range(34,4).value =  "Files Extracted"
+        myWorkBook.sheets[mySheet].range(35,4).value =  written
+        myWorkBook.sheets[mySheet].range(34,8).value =  "Duplicate File Names Skipped"
+        myWorkBook.sheets[mySheet].range(35,8).value =  len( duplicates )
+        myWorkBook.sheets[mySheet].range(32,4).value =  "File Organization Complete"
+        return
     #Delete the content of the folder you will be sending the files to.
     # We do this as organization to make sure all the files are current
     for root, dirs, files in os.walk(path + '\\Python_RawData_Combined'):
@@ -132,7 +158,8 @@ def extractAllZip_Files( path ):
 
 
 
-def createPickleFiles( currentDirectory ):
+def createPickleFiles( currentDirectory , processes = 1 , compact = False ,
+                       fromArchives = False ):
     '''
     XL Wings FUNCTION
     
@@ -142,6 +169,15 @@ def createPickleFiles( currentDirectory ):
     
     @param currentDirectory  - String, where the excel file is located 
                                        (passed as an argument from EXCEL using UDF)
+    @param processes         - int, number of worker processes used to parse
+                                       the raw files, None will use every
+                                       core of the machine, 1 runs serially
+    @param compact           - Boolean, True only stores the raw columns used
+                                       by the level 1 processing as float32
+    @param fromArchives      - Boolean, True reads the .csv and .epw files 
+                                       directly out of the archives of \RawData,
+                                       extractAllZip_Files() does not need to
+                                       be run
     @return void             - pickle containig tuples of (series:location data, dataframe:metadata)               
     '''
     #XL Wings
@@ -173,23 +209,25 @@ def createPickleFiles( currentDirectory ):
                                 "Merging IWEC , CWEC, and TMY3 data together"
     myWorkBook.sheets[mySheet].range(50,6).value = "Total Files"
     # Get a list of all the raw files
-    fileNames = rawDataImport.rawFilesNamesList( path )
+    fileNames = rawDataImport.rawSourcesList( path , fromArchives )
     myWorkBook.sheets[mySheet].range(51,6).value = len(fileNames)
     # Aggregate raw data to tuples containing  ( series:location data , 
     #                                            dataframe: metadata)
-    rawDataImport.rawDataToTuple( path ) 
+    #    and collect the first row summary records of the same parse
+    firstRowRecords = rawDataImport.rawDataToTuple( path , processes , compact , fromArchives ) 
     myWorkBook.sheets[mySheet].range(48,4).value = "Creating Summary Sheet"
     myWorkBook.sheets[mySheet].range(50,4).value = ""
     myWorkBook.sheets[mySheet].range(50,6).value = ""
     myWorkBook.sheets[mySheet].range(51,4).value = ""
     myWorkBook.sheets[mySheet].range(51,6).value = ""
     # Create a summary frame of the raw data
-    rawDataImport.createPickleFileFirstRow( path )
+    rawDataImport.createPickleFileFirstRow( path , firstRowRecords )
     myWorkBook.sheets[mySheet].range(48,4).value = "Pickles Sucessfully Saved"
     
     
 
-def createLevel_1_Pickles( currentDirectory ): 
+def createLevel_1_Pickles( currentDirectory , processes = 1 , incremental = False ,
+                           storeFormat = 'pickle' ): 
     '''
     XL Wings FUNCTION
     
@@ -202,6 +240,15 @@ def createLevel_1_Pickles( currentDirectory ):
     
     param@ currentDirectory     - String, where the excel file is located 
                                        (passed as an argument from EXCEL using UDF)
+    param@ processes            - int, number of worker processes used to 
+                                       process the sites, None will use every
+                                       core of the machine, 1 runs serially
+    param@ incremental          - Boolean, True only reprocesses the sites that
+                                       are new or whose raw data or processing
+                                       code changed, False deletes and 
+                                       reprocesses every site
+    param@ storeFormat          - String, 'pickle' or 'parquet' (requires pyarrow)
+                                       format of the Level 1 site files
     
      @return void               - Will convert dataframes into pickle datafiles  
                     *Note: each location will be saved as its own .pickle file                 
@@ -216,27 +263,71 @@ def createLevel_1_Pickles( currentDirectory ):
     myWorkBook.sheets[mySheet].range(64,4).value = "Processing Files"
     myWorkBook.sheets[mySheet].range(66,4).value = "Files Processed"
     myWorkBook.sheets[mySheet].range(66,6).value = "Total Files"
-    #First delete the content of the folder you will be sending the files to.
-    # We do this as organization to make sure all the files are current
-    for root, dirs, files in os.walk(currentDirectory + \
-                              '\\Pandas_Pickle_DataFrames\\Pickle_Level1'):
-        for f in files:
-            os.unlink(os.path.join(root, f))
-        for d in dirs:
-            shutil.rmtree(os.path.join(root, d))
-    for root, dirs, files in os.walk(currentDirectory + \
-                        '\\Pandas_Pickle_DataFrames\\Pickle_Level1_Summary'):
-        for f in files:
-            os.unlink(os.path.join(root, f))
-        for d in dirs:
-            shutil.rmtree(os.path.join(root, d))
+    if not incremental:
+        #First delete the content of the folder you will be sending the files to.
+        # We do this as organization to make sure all the files are current
+        for root, dirs, files in os.walk(currentDirectory + \
+                                  '\\Pandas_Pickle_DataFrames\\Pickle_Level1'):
+            for f in files:
+                os.unlink(os.path.join(root, f))
+            for d in dirs:
+                shutil.rmtree(os.path.join(root, d))
+        for root, dirs, files in os.walk(currentDirectory + \
+                            '\\Pandas_Pickle_DataFrames\\Pickle_Level1_Summary'):
+            for f in files:
+                os.unlink(os.path.join(root, f))
+            for d in dirs:
+                shutil.rmtree(os.path.join(root, d))
     # This is the largest computation currently
-    finalOutputFrame.level_1_df_toPickle( currentDirectory )
+    # Incremental runs only reprocess the sites listed as stale by the manifest
+    finalOutputFrame.level_1_df_toPickle( currentDirectory , processes , incremental , storeFormat )
     # User feedback
     myWorkBook.sheets[mySheet].range(64,4).value = "All Files Sucessfully Saved"
 
 
 
+def createHourlyCube( currentDirectory ): 
+    '''
+    XL Wings FUNCTION
+    
+    createHourlyCube()
+    
+    Optional stage after createLevel_1_Pickles().  Copy the hourly data of 
+    every Level 1 site into one memory mapped array ( sites x 8760 x variables )
+    with a site index so cross site queries are array slices.  Stored in 
+    \Pandas_Pickle_DataFrames\Pickle_Level1_Cube
+    
+    param@ currentDirectory     - String, where the excel file is located 
+                                       (passed as an argument from EXCEL using UDF)
+    
+     @return void               - Will store hourlyCube.npy and hourlyCubeIndex.pickle
+    '''    
+    hourlyCube.createHourlyCube( currentDirectory )
+
+
+
+def createSummaryGrids( currentDirectory , resolution = 0.5 , method = 'nearest' ): 
+    '''
+    XL Wings FUNCTION
+    
+    createSummaryGrids()
+    
+    Optional stage after createLevel_1_Pickles().  Rasterize every metric of
+    the Level 1 summary onto a global Lat/Lon grid so the maps can draw the 
+    metrics as one image.  Stored in \Pandas_Pickle_DataFrames\Pickle_Level1_Grids
+    
+    param@ currentDirectory     - String, where the excel file is located 
+                                       (passed as an argument from EXCEL using UDF)
+    param@ resolution           - float, size of a grid cell in Decimal Degrees
+    param@ method               - String, 'nearest' site, 'idw' or 'kriging'
+                                       interpolation of the closest sites
+    
+     @return void               - Will store summaryGrid_<method>_<resolution>.npz
+    '''    
+    summaryGrid.createSummaryGrids( currentDirectory , float( resolution ) , method )
+
+
+
 def outputFileSummary( currentDirectory ):
     '''
     XL Wings FUNCTION
@@ -317,31 +408,24 @@ def searchRawPickle_Output( currentDirectory , userInput):
     mySheet = myWorkBook.sheets[2]
     #############
     path = currentDirectory
-    rawfileNames = cleanRawOutput.filesNameList( path )
+    # Look up the files and summary row of the site in the site index
+    entry = siteIndex.findSite( path , userInput )
+    if entry is None:
+        return
     summary_df = cleanRawOutput.dataSummaryFrame( path )
-    uniqueID_List = cleanRawOutput.stringList_UniqueID_List(rawfileNames)
-    booleanSearch = summary_df["Site Identifier Code"].str.find(userInput) 
-    for r in range( 0 , len(booleanSearch)):
-        if booleanSearch[r] == 0:
-            summaryRow_df = summary_df.iloc[r,:]
-            break
-    for i in range(0 , len( rawfileNames ) ):
-        #If the user input is a match with a raw data file
-        if userInput == uniqueID_List[i]:
-            # Pull out the raw pickle of the located file name
-            data_tuple = pd.read_pickle( path + \
-                '/Pandas_Pickle_DataFrames/Pickle_RawData/' + rawfileNames[i] )
-            #Unpack the tuple
-            location_series , raw_df = data_tuple            
-            rawcolumnHeaders_list = list(raw_df)
-            summaryColumnHeaders_list = list(summary_df) 
-            myWorkBook.sheets[mySheet].range(9,1).value = rawcolumnHeaders_list
-            myWorkBook.sheets[mySheet].range(10,1).value = raw_df.values.tolist()
-            myWorkBook.sheets[mySheet].range(6,1).value = summaryColumnHeaders_list
-            # Output the summary row for that location
-            myWorkBook.sheets[mySheet].range(7,1).value =  summaryRow_df.tolist()
-            #Stop the search for loop once the file is located
-            break  
+    summaryRow_df = summary_df.iloc[ entry['summaryRow'] , : ]
+    # Pull out the raw pickle of the located file name
+    data_tuple = pd.read_pickle( path + \
+        '/Pandas_Pickle_DataFrames/Pickle_RawData/' + entry['rawFile'] )
+    #Unpack the tuple
+    location_series , raw_df = data_tuple            
+    rawcolumnHeaders_list = list(raw_df)
+    summaryColumnHeaders_list = list(summary_df) 
+    myWorkBook.sheets[mySheet].range(9,1).value = rawcolumnHeaders_list
+    myWorkBook.sheets[mySheet].range(10,1).value = raw_df.values.tolist()
+    myWorkBook.sheets[mySheet].range(6,1).value = summaryColumnHeaders_list
+    # Output the summary row for that location
+    myWorkBook.sheets[mySheet].range(7,1).value =  summaryRow_df.tolist()
 
 
 
@@ -368,30 +452,22 @@ def search_Level1_Pickle_Output( currentDirectory , userInput):
     mySheet = myWorkBook.sheets[2]
     #############
     path = currentDirectory
-    rawfileNames = cleanRawOutput.filesNameList( path )
+    # Look up the files and summary row of the site in the site index
+    entry = siteIndex.findSite( path , userInput )
+    if entry is None:
+        return
     summary_df = cleanRawOutput.dataSummaryFrame( path )
-    uniqueID_List = cleanRawOutput.stringList_UniqueID_List(rawfileNames)
-    booleanSearch = summary_df["Site Identifier Code"].str.find(userInput) 
-    for r in range( 0 , len(booleanSearch)):
-        if booleanSearch[r] == 0:
-            summaryRow_df = summary_df.iloc[r,:]
-            break
-    for i in range(0 , len( rawfileNames ) ):
-        #If the user input is a match with a raw data file
-        if userInput == uniqueID_List[i]:
-            # Pull out the raw pickle of the located file name
-            data_tuple = pd.read_pickle( path + \
-                '/Pandas_Pickle_DataFrames/Pickle_Level1/' + rawfileNames[i] )
-            #Unpack the tuple
-            location_series , raw_df = data_tuple
-            rawcolumnHeaders_list = list(raw_df)
-            summaryColumnHeaders_list = list(summary_df)
-            myWorkBook.sheets[mySheet].range(9,1).value = rawcolumnHeaders_list
-            myWorkBook.sheets[mySheet].range(10,1).value = raw_df.values.tolist()
-            myWorkBook.sheets[mySheet].range(6,1).value = summaryColumnHeaders_list
-            myWorkBook.sheets[mySheet].range(7,1).value =  summaryRow_df.tolist()
-            #Stop the search for loop once the file is located
-            break
+    summaryRow_df = summary_df.iloc[ entry['summaryRow'] , : ]
+    # Pull out the level 1 data of the located file name ( pickle or Parquet )
+    data_tuple = level1Store.readLevel1( path , entry['rawFile'] )
+    #Unpack the tuple
+    location_series , raw_df = data_tuple
+    rawcolumnHeaders_list = list(raw_df)
+    summaryColumnHeaders_list = list(summary_df)
+    myWorkBook.sheets[mySheet].range(9,1).value = rawcolumnHeaders_list
+    myWorkBook.sheets[mySheet].range(10,1).value = raw_df.values.tolist()
+    myWorkBook.sheets[mySheet].range(6,1).value = summaryColumnHeaders_list
+    myWorkBook.sheets[mySheet].range(7,1).value =  summaryRow_df.tolist()
 
 
 
@@ -434,7 +510,44 @@ def closest_Cities( currentDirectory ,  lat1 , lon1 ):
 
 
 
-def createTempMap(path , mapSelect ):
+def closest_Cities_Batch( currentDirectory , inputCSV , k = 1 ):
+    '''
+    XL Wings FUNCTION
+    
+    closest_Cities_Batch()
+    
+    Find the k closest locations of every point of interest of a CSV file
+    with Latitude and Longitude columns in Decimal Degrees.  The results are
+    written next to the input file as <input name>_closestSites.csv
+    
+    param@ currentDirectory   - String, where the excel file is located 
+                                       (passed as an argument from EXCEL using UDF)
+     @param inputCSV          - String, path of the CSV file of points
+     @param k                 - int, number of closest locations of every point
+     @return void             - writes the closest locations of every point 
+                                     and reports the output file to excel
+    '''    
+    #XL Wings
+    ##############
+    # Use the xl wings caller function to establish handshake with excel
+    myWorkBook = xw.Book.caller() 
+    #Reference sheet 0    
+    mySheet = myWorkBook.sheets[1]
+    ##############
+    outputCSV = os.path.splitext( inputCSV )[0] + '_closestSites.csv'
+    closest_df = closestLatLon.closestLocationsCSV( currentDirectory , 
+                                                    inputCSV , 
+                                                    outputCSV , 
+                                                    int( k ) )
+    myWorkBook.sheets[mySheet].range(6,4).value = "Closest Sites File"
+    myWorkBook.sheets[mySheet].range(7,4).value = outputCSV
+    myWorkBook.sheets[mySheet].range(6,5).value = "Rows"
+    myWorkBook.sheets[mySheet].range(7,5).value = len( closest_df )
+
+
+
+def createTempMap(path , mapSelect , gridResolution = None , gridMethod = 'nearest' ,
+                  maxDistance = summaryGrid.mapMaxDistance ):
     '''
     XL Wings FUNCTION
     
@@ -447,6 +560,11 @@ def createTempMap(path , mapSelect ):
                                        (passed as an argument from EXCEL using UDF)
     @param mapSelect  - String, used to select what type of map to render
                                 - See "MapDewYield.py" for exact string to pass                                  
+    @param gridResolution - Float, cell size of the gridded layer, None draws 
+                                a circle per site
+    @param gridMethod - String, 'nearest', 'idw' or 'kriging'
+    @param maxDistance - Float, grid cells farther than this from every site 
+                                are not drawn (km), None draws every cell
     
     @return void      - Will render a map          
     '''    
@@ -456,11 +574,12 @@ def createTempMap(path , mapSelect ):
     xw.Book.caller() 
     #Reference sheet 0    
     ##############
-    mapTemp.outputMapTemp(path , mapSelect )
+    mapTemp.outputMapTemp(path , mapSelect , gridResolution , gridMethod , maxDistance )
 
 
 
-def outputMapDriver( currentDirectory , mapType ):
+def outputMapDriver( currentDirectory , mapType , gridResolution = None , gridMethod = 'nearest' ,
+                     maxDistance = summaryGrid.mapMaxDistance ):
     '''
     XL Wings FUNCTIONS
     
@@ -471,10 +590,17 @@ def outputMapDriver( currentDirectory , mapType ):
     @param currentDirectory    - String, where the excel file is located 
                                        (passed as an argument from EXCEL using UDF)
     @param mapType             - String, The type of data to display as a map
+    @param gridResolution      - Float, cell size of the gridded layer, None 
+                                       draws a circle per site
+    @param gridMethod          - String, 'nearest', 'idw' or 'kriging'
+    @param maxDistance         - Float, grid cells farther than this from every 
+                                       site are not drawn (km), None draws 
+                                       every cell
                            
     @return void               - Void, Renders a world map          
     '''    
-    mapGenerator.mapGeneratorDriver(currentDirectory , mapType)
+    mapGenerator.mapGeneratorDriver(currentDirectory , mapType , gridResolution , gridMethod ,
+                                    maxDistance)
 
 
 
@@ -7,9 +7,28 @@ Class contains utility functions functions pertaining to raw data imports
 import pandas as pd
 import glob
 import os 
+import re
+from collections import namedtuple
+from functools import lru_cache
 
 class cleanRawOutput:   
 
+    # Site identifier, first 3 digits in a row and the 3 characters after them
+    #    ( the same 6 characters the old character by character search found )
+    uniqueIDPattern = re.compile( r'[0-9]{3}.{3}' )
+    # Data source tag of the file name : data source
+    dataSourcePattern = re.compile( r'TYA|CWE|IW2' )
+    dataSources = { 'TYA' : 'TMY3' ,
+                    'CWE' : 'CWEC' ,
+                    'IW2' : 'IWEC' }
+    # Leading 3 letter country code of IWEC/CWEC/EPW file names
+    countryPattern = re.compile( r'^[A-Z]{3}_' )
+    # Extensions removed before a file name is parsed
+    fileExtensions = ( '.csv' , '.epw' , '.pickle' , '.parquet' )
+    # Record of a parsed file name
+    fileNameRecord = namedtuple( 'fileNameRecord' , [ 'siteID' , 'dataSource' , 'stationName' ] )
+
+
     def dataSummaryFrame( path ):
         '''
         HELPER FUNCTION
@@ -84,12 +103,48 @@ class cleanRawOutput:
         @return sampleList     - List of Strings, list of filtered strings with
                                                         unique identifiers
         '''
-        sampleList = []
-        for i in range(0, len(listOfStrings)):
-            
-            sampleList.append(cleanRawOutput.string_UniqueID( listOfStrings[ i ] ) )
-              
-        return sampleList         
+        return [ cleanRawOutput.string_UniqueID( x ) for x in listOfStrings ]
+
+
+
+    @lru_cache( maxsize = None )
+    def parseFileName( fileName ):
+        '''
+        parseFileName()
+        
+        Parse a raw data file name with the compiled patterns.  The result of
+        every file name is cached so a name is only parsed once.
+        
+        Example String                                  Return Record
+        
+        '690190TYA.pickle'                          ( '690190' , 'TMY3' , '' )
+        'GRC_SOUDA(AP)_167460_IW2.pickle'           ( '167460' , 'IWEC' , 'SOUDA(AP)' )
+        'IND_New.Delhi-Safdarjung.421820_ISHRAE'    ( '421820' , 'UNKNOWN' , 'New.Delhi-Safdarjung' )
+        'Test'                                      ( 'Test' , 'UNKNOWN' , '' )
+        
+        @param fileName     - String, file name ( or path ) of the raw data
+        
+        @return record      - fileNameRecord, ( siteID , dataSource , stationName )
+                                    siteID is the file name if no identifier
+                                    is found, dataSource is TMY3, CWEC, IWEC 
+                                    or UNKNOWN
+        '''
+        sourceMatch = cleanRawOutput.dataSourcePattern.search( fileName )
+        if sourceMatch is None:
+            dataSource = 'UNKNOWN'
+        else:
+            dataSource = cleanRawOutput.dataSources[ sourceMatch.group() ]
+        match = cleanRawOutput.uniqueIDPattern.search( fileName )
+        if match is None:
+            return cleanRawOutput.fileNameRecord( fileName , dataSource , '' )
+        # The station name is between the country code and the identifier
+        baseName = os.path.basename( fileName )
+        if baseName.lower().endswith( cleanRawOutput.fileExtensions ):
+            baseName = os.path.splitext( baseName )[0]
+        nameMatch = cleanRawOutput.uniqueIDPattern.search( baseName )
+        stationName = baseName[ : nameMatch.start() ] if nameMatch is not None else ''
+        stationName = cleanRawOutput.countryPattern.sub( '' , stationName ).strip( '_.- ' )
+        return cleanRawOutput.fileNameRecord( match.group() , dataSource , stationName )
 
 
 
@@ -98,9 +153,8 @@ class cleanRawOutput:
         stringList_UniqueID_List()
         
         This method takes a strings and searches for a unique sample 
-        identifier. It then takes that unique identifier and creates a list. 
-        If one of the strings does not have a unique identifier it will put 
-        that original string back into the list
+        identifier.  If the string does not have a unique identifier the 
+        original string is returned, see parseFileName()
         
         Example String
         
@@ -119,40 +173,7 @@ class cleanRawOutput:
         @param fileName     - String, string containing unique identifier
         @return uniqueID    - String, filtered strings with unique identifiers
         '''
-
-        #Create a list of ASCII characters 
-        ascii_list =[ord(c) for c in fileName]
-        #Create a char list 
-        char_list = list(fileName)
-        count = 0 
-        # j will be the index referencing the next ASCII character
-        for j in range(0, len(ascii_list)):
-            #Filter to find a unique combination of characters and ints 
-            ###############
-            # ASCII characters for numbers 0 - 10
-            if ascii_list[j] >= 48 and ascii_list[j] <= 57:
-                #If a number is encountered increase the counter
-                count = count + 1
-                # If the count is 6 "This is how many numbers in a row 
-                    #the unique identifier will be"
-                if count == 3:
-                    # Create a string of the unique identifier
-                    uniqueID = ( char_list[ j - 2 ] +
-                                       char_list[ j - 1 ] + 
-                                       char_list[ j ]     + 
-                                       char_list[ j + 1 ] + 
-                                       char_list[ j + 2 ] + 
-                                       char_list[ j + 3 ] )
-                    # Stop the search.  The identifier has been located
-                    break
-            # If the next ASCII character is not a number reset the counter       
-            else:
-                count = 0
-        # If a unique identifier is not located insert string as placeholder
-        # so that indexing is not corrupted
-        if count == 0 and j == len(ascii_list) - 1 :  
-           uniqueID = fileName              
-        return uniqueID 
+        return cleanRawOutput.parseFileName( fileName ).siteID
 
 
 
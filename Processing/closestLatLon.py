@@ -10,14 +10,37 @@ Assumed that users will be using Decimal degrees to define Latitude and Longitud
 
 Will use Haversine formula to calculate the distance on a sphere ( the globe )
 
+The sites are indexed once in a KD-tree of 3D unit vectors ( scipy ) that is 
+stored next to the Level 1 summary pickle.  The straight line ( chord ) 
+distance between unit vectors grows with the distance on the globe so the 
+nearest sites of the tree are the nearest sites on the globe.  Without scipy
+the distance to every site is found with numpy and sorted.
+
 @author: Derek Holsapple
 """
 
 from math import cos, asin, sqrt
+import os
+import pickle
+import numpy as np
 import pandas as pd
 
+# scipy is optional, only needed for the KD-tree
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
 class closestLatLon:    
 
+    # Diameter of the earth used by the Haversine formula (km)
+    earthDiameter = 12742
+    # Level 1 summary columns returned by the batch searches
+    batchColumns = [ 'Site Identifier Code' ,
+                     'Station name' ,
+                     'Site latitude' ,
+                     'Site longitude' ]
+
     
     
     def distance(lat1, lon1, lat2, lon2):
@@ -45,6 +68,195 @@ class closestLatLon:
     
     
 
+    def distanceArray( lat1 , lon1 , lat2 , lon2 ):
+        '''
+        HELPER FUNCTION
+        
+        distanceArray()
+        
+        Vectorized distance(), the Haversine distance (kilometers) between 
+        arrays of Lat/Lon ( or one Lat/Lon and an array )
+        
+        @param lat1       -Float or numpy array, Latitude of location 1 in Decimal Degrees
+        @param lon1       -Float or numpy array, Longitude of location 1 in Decimal Degrees
+        @param lat2       -Float or numpy array, Latitude of location 2 in Decimal Degrees
+        @param lon2       -Float or numpy array, Longitude of location 2 in Decimal Degrees
+        
+        @return           -numpy array, distance in kilometers
+        '''
+        p = 0.017453292519943295
+        lat1 = np.asarray( lat1 , dtype = np.float64 )
+        lon1 = np.asarray( lon1 , dtype = np.float64 )
+        lat2 = np.asarray( lat2 , dtype = np.float64 )
+        lon2 = np.asarray( lon2 , dtype = np.float64 )
+        a = 0.5 - np.cos((lat2-lat1)*p)/2 + np.cos(lat1*p)*np.cos(lat2*p) * \
+            (1-np.cos((lon2-lon1)*p)) / 2
+        # Rounding can push a just outside of 0 to 1
+        return closestLatLon.earthDiameter * np.arcsin( np.sqrt( np.clip( a , 0 , 1 ) ) )
+    
+    
+    
+    def toUnitVectors( lat , lon ):
+        '''
+        HELPER FUNCTION
+        
+        toUnitVectors()
+        
+        Convert Lat/Lon to 3D unit vectors ( x , y , z ) on the sphere
+        
+        @param lat        -numpy array, Latitude in Decimal Degrees
+        @param lon        -numpy array, Longitude in Decimal Degrees
+        
+        @return           -numpy array, ( points , 3 ) unit vectors
+        '''
+        lat = np.radians( np.asarray( lat , dtype = np.float64 ) )
+        lon = np.radians( np.asarray( lon , dtype = np.float64 ) )
+        return np.column_stack( ( np.cos( lat ) * np.cos( lon ) ,
+                                  np.cos( lat ) * np.sin( lon ) ,
+                                  np.sin( lat ) ) )
+    
+    
+    
+    def spatialIndexPath( currentDirectory ):
+        '''
+        HELPER FUNCTION
+        
+        spatialIndexPath()
+        
+        @param currentDirectory - String, of the current working directory
+        
+        @return                 - String, path of the spatial index pickle
+        '''
+        return currentDirectory + '\\Pandas_Pickle_DataFrames\\Pickle_Level1_Summary' + \
+                                  '\\siteSpatialIndex.pickle'
+    
+    
+    
+    def summaryPath( currentDirectory ):
+        '''
+        HELPER FUNCTION
+        
+        summaryPath()
+        
+        @param currentDirectory - String, of the current working directory
+        
+        @return                 - String, path of the Level 1 summary pickle
+        '''
+        return currentDirectory + '\\Pandas_Pickle_DataFrames\\Pickle_Level1_Summary' + \
+                                  '\\Pickle_Level1_Summary.pickle'
+    
+    
+    
+    def createSpatialIndex( currentDirectory ):
+        '''
+        EXECUTION FUNCTION
+        
+        createSpatialIndex()
+        
+        Index the coordinates of the Level 1 summary sites and store the index
+        next to the summary pickle.  The rows of the index are the rows of 
+        the summary.  Sites without coordinates are left out of the tree.
+        
+        @param currentDirectory - String, of the current working directory
+        
+        @return spatialIndex    - Dictionary, 
+                                    'summaryMtime'  modified time of the summary
+                                    'latLon'        ( sites , 2 ) coordinates
+                                    'rows'          summary row of every tree point
+                                    'tree'          cKDTree of the unit vectors,
+                                                    None without scipy
+        '''
+        summary_df = pd.read_pickle( closestLatLon.summaryPath( currentDirectory ) )
+        latLon = summary_df[['Site latitude', 'Site longitude']].astype(float).values
+        rows = np.nonzero( ~np.isnan( latLon ).any( axis = 1 ) )[0]
+        tree = None
+        if cKDTree is not None:
+            tree = cKDTree( closestLatLon.toUnitVectors( latLon[ rows , 0 ] , latLon[ rows , 1 ] ) )
+        spatialIndex = { 'summaryMtime' : os.path.getmtime( closestLatLon.summaryPath( currentDirectory ) ) ,
+                         'latLon' : latLon ,
+                         'rows' : rows ,
+                         'tree' : tree }
+        with open( closestLatLon.spatialIndexPath( currentDirectory ) , 'wb' ) as f:
+            pickle.dump( spatialIndex , f )
+        return spatialIndex
+    
+    
+    
+    def loadSpatialIndex( currentDirectory ):
+        '''
+        HELPER FUNCTION
+        
+        loadSpatialIndex()
+        
+        Load the spatial index of the sites, it is created again if it does 
+        not exist or the Level 1 summary changed since it was created
+        
+        @param currentDirectory - String, of the current working directory
+        
+        @return spatialIndex    - Dictionary, see createSpatialIndex()
+        '''
+        indexPath = closestLatLon.spatialIndexPath( currentDirectory )
+        if os.path.isfile( indexPath ):
+            with open( indexPath , 'rb' ) as f:
+                spatialIndex = pickle.load( f )
+            if spatialIndex['summaryMtime'] == os.path.getmtime( closestLatLon.summaryPath( currentDirectory ) ) and \
+                    ( spatialIndex['tree'] is not None or cKDTree is None ):
+                return spatialIndex
+        return closestLatLon.createSpatialIndex( currentDirectory )
+    
+    
+    
+    def nearestSites( spatialIndex , lat1 , lon1 , k = None , radius = None ):
+        '''
+        HELPER FUNCTION
+        
+        nearestSites()
+        
+        Find the sites closest to a point of interest, sorted from closest to
+        farthest.  The KD-tree answers k nearest and radius queries, all sites
+        ( or no tree ) are found with the vectorized distance to every site.
+        
+        @param spatialIndex     - Dictionary, see createSpatialIndex()
+        @param lat1             - Float, given Latitude in Decimal Degrees
+        @param lon1             - Float, given Longitude in Decimal Degrees
+        @param k                - int, number of sites to return, None 
+                                        returns every site ( in the radius )
+        @param radius           - Float, only return the sites closer than 
+                                        this distance (km), None has no limit
+        
+        @return rows            - numpy array, summary rows of the sites
+        @return distances       - numpy array, distance of the sites (km)
+        '''
+        latLon = spatialIndex['latLon']
+        rows = spatialIndex['rows']
+        tree = spatialIndex['tree']
+        if tree is not None and ( k is not None or radius is not None ):
+            point = closestLatLon.toUnitVectors( [ lat1 ] , [ lon1 ] )[0]
+            if radius is not None:
+                # Chord length of the radius on the unit sphere
+                chord = 2 * np.sin( min( radius / closestLatLon.earthDiameter , np.pi / 2 ) )
+                found = np.asarray( tree.query_ball_point( point , chord ) , dtype = np.int64 )
+            else:
+                found = np.atleast_1d( tree.query( point , k = min( k , len( rows ) ) )[1] )
+            found = rows[ found ]
+        else:
+            found = rows
+        distances = closestLatLon.distanceArray( lat1 , lon1 , latLon[ found , 0 ] , latLon[ found , 1 ] )
+        # Stable sort, sites the same distance away keep the summary order
+        order = np.argsort( distances , kind = 'stable' )
+        found = found[ order ]
+        distances = distances[ order ]
+        if radius is not None:
+            keep = distances <= radius
+            found = found[ keep ]
+            distances = distances[ keep ]
+        if k is not None:
+            found = found[ : k ]
+            distances = distances[ : k ]
+        return found , distances
+    
+    
+
     def calcDistanceFrame(currentDirectory ,  lat1 , lon1 ):
         '''
         HELPER FUNCTION
@@ -71,57 +283,202 @@ class closestLatLon:
         latLong_df = firstRow_summary_df[['Site latitude', \
                                 'Site longitude']].astype(float)
         # Create a Distance column between every Lat and Long 
-        firstRow_summary_df['Distance(km)'] = latLong_df.apply(lambda x: \
-                            closestLatLon.distance(lat1, 
-                                                   lon1, 
-                                                   x['Site latitude'], 
-                                                   x['Site longitude']) , 
-                                                   axis=1)
+        firstRow_summary_df['Distance(km)'] = closestLatLon.distanceArray( lat1 ,
+                                                                           lon1 ,
+                                                                           latLong_df['Site latitude'].values ,
+                                                                           latLong_df['Site longitude'].values )
         return firstRow_summary_df    
          
     
 
     
-    def closestLocationFrame( currentDirectory ,  lat1 , lon1 ):
+    def closestLocationFrame( currentDirectory ,  lat1 , lon1 , k = None , radius = None ):
         '''
         HELPER FUNCTION
         
         closestLocationList()
         
         Function to sort the dataframe from closest location to farthest location.
+        The sites are found with the spatial index, see nearestSites()
         
         @param currentDirectory      - String, of the current working directory                                  
         @param lat1                  - Float, given Latitude in Decimal Degrees
         @param lon1                  - Float, given Longitude in Decimal Degrees
+        @param k                     - int, number of closest locations to 
+                                                    return, None returns all
+        @param radius                - Float, only return locations closer than
+                                                    this distance (km)
         
         @return firstRow_summary_df  - Dataframe, dataframe of summary stats with 
                                                     distance from point of interest
         @return columnNames          - List of Strings, list of the column 
                                                         names for the dataFrame                                            
         '''        
-        firstRow_summary_df = closestLatLon.calcDistanceFrame(currentDirectory,
-                                                              lat1 , 
-                                                              lon1 )
-        closeLocationsList = []
-        for i in range(0 , len(firstRow_summary_df)):
-            # Find the index number row of the closest city
-            closeLocationIndex = firstRow_summary_df['Distance(km)']\
-                                    .idxmin(axis=0, skipna=True)
-            # reference the closest index and turn the series into a list
-            tempClose = firstRow_summary_df.loc[closeLocationIndex, : ].\
-                                    values.tolist()
-            # Put the closest location on top of the list
-            closeLocationsList.append(tempClose)
-            # Remove the closest index location
-            firstRow_summary_df = firstRow_summary_df\
-                                    .drop([closeLocationIndex] , axis=0)
-        # Create a list of column names to output to excel    
-        columnNames = list(firstRow_summary_df)    
-                # Create a dataframe of all the sorted data
-        closeLocationsFrame = pd.DataFrame(data = closeLocationsList , \
-                                           columns = columnNames)
+        firstRow_summary_df = pd.read_pickle( closestLatLon.summaryPath( currentDirectory ) )
+        spatialIndex = closestLatLon.loadSpatialIndex( currentDirectory )
+        rows , distances = closestLatLon.nearestSites( spatialIndex , lat1 , lon1 , k , radius )
+        # Closest location on top, the distance is the first column
+        closeLocationsFrame = firstRow_summary_df.iloc[ rows , : ].reset_index( drop = True )
+        closeLocationsFrame.insert( 0 , 'Distance(km)' , distances )
         columnNames = list(closeLocationsFrame.columns)
-        columnNames = [columnNames[-1]] + columnNames[:-1]
-        closeLocationsFrame = closeLocationsFrame[columnNames]
 
         return closeLocationsFrame , columnNames
+
+    
+    
+    def nearestSitesBatch( spatialIndex , lat1 , lon1 , k = 1 , chunkSize = 10000 ):
+        '''
+        HELPER FUNCTION
+        
+        nearestSitesBatch()
+        
+        Find the k closest sites of many points of interest at once.  The 
+        points are processed in vectorized chunks, with the KD-tree when scipy
+        is installed, otherwise with the distance from the chunk of points to
+        every site ( the chunk is made smaller so the distance matrix stays 
+        around 4 million values ).
+        
+        @param spatialIndex     - Dictionary, see createSpatialIndex()
+        @param lat1             - numpy array, Latitudes in Decimal Degrees
+        @param lon1             - numpy array, Longitudes in Decimal Degrees
+        @param k                - int, number of sites found for every point
+        @param chunkSize        - int, number of points processed at once
+        
+        @return rows            - numpy array, ( points , k ) summary rows of 
+                                        the sites sorted closest first, -1 
+                                        for a point without a finite 
+                                        Latitude and Longitude
+        @return distances       - numpy array, ( points , k ) distance of the 
+                                        sites (km), NaN for a point without 
+                                        a finite Latitude and Longitude
+        '''
+        lat1 = np.asarray( lat1 , dtype = np.float64 ).ravel()
+        lon1 = np.asarray( lon1 , dtype = np.float64 ).ravel()
+        latLon = spatialIndex['latLon']
+        siteRows = spatialIndex['rows']
+        tree = spatialIndex['tree']
+        k = min( k , len( siteRows ) )
+        # Blank or NaN coordinates are not searched ( the KD-tree rejects them )
+        finite = np.isfinite( lat1 ) & np.isfinite( lon1 )
+        if not finite.all():
+            rows = np.full( ( len( lat1 ) , k ) , -1 , dtype = np.int64 )
+            distances = np.full( ( len( lat1 ) , k ) , np.nan )
+            rows[ finite ] , distances[ finite ] = closestLatLon.nearestSitesBatch( spatialIndex ,
+                                                                                    lat1[ finite ] ,
+                                                                                    lon1[ finite ] ,
+                                                                                    k , chunkSize )
+            return rows , distances
+        if tree is None:
+            chunkSize = max( 1 , min( chunkSize , 4000000 // max( 1 , len( siteRows ) ) ) )
+        rows = np.empty( ( len( lat1 ) , k ) , dtype = np.int64 )
+        distances = np.empty( ( len( lat1 ) , k ) , dtype = np.float64 )
+        for start in range( 0 , len( lat1 ) , chunkSize ):
+            chunk = slice( start , start + chunkSize )
+            if tree is not None:
+                found = tree.query( closestLatLon.toUnitVectors( lat1[ chunk ] , lon1[ chunk ] ) , k = k )[1]
+                found = siteRows[ np.asarray( found ).reshape( -1 , k ) ]
+            else:
+                allDistances = closestLatLon.distanceArray( lat1[ chunk , None ] ,
+                                                            lon1[ chunk , None ] ,
+                                                            latLon[ siteRows , 0 ][ None , : ] ,
+                                                            latLon[ siteRows , 1 ][ None , : ] )
+                if k < len( siteRows ):
+                    found = np.argpartition( allDistances , k - 1 , axis = 1 )[ : , : k ]
+                else:
+                    found = np.tile( np.arange( len( siteRows ) ) , ( allDistances.shape[0] , 1 ) )
+                found = siteRows[ found ]
+            chunkDistances = closestLatLon.distanceArray( lat1[ chunk , None ] ,
+                                                          lon1[ chunk , None ] ,
+                                                          latLon[ found , 0 ] ,
+                                                          latLon[ found , 1 ] )
+            # Sort every point closest first ( ties keep the summary order )
+            order = np.lexsort( ( found , chunkDistances ) , axis = 1 )
+            rows[ chunk ] = np.take_along_axis( found , order , axis = 1 )
+            distances[ chunk ] = np.take_along_axis( chunkDistances , order , axis = 1 )
+        return rows , distances
+    
+    
+    
+    def closestLocationsBatch( currentDirectory , lat1 , lon1 , k = 1 , columns = None ):
+        '''
+        EXECUTION FUNCTION
+        
+        closestLocationsBatch()
+        
+        Find the k closest locations of many points of interest.  The summary
+        and the spatial index are loaded once for all of the points.
+        
+        @param currentDirectory - String, of the current working directory
+        @param lat1             - array like, Latitudes in Decimal Degrees
+        @param lon1             - array like, Longitudes in Decimal Degrees
+        @param k                - int, number of closest locations of every point
+        @param columns          - List of Strings, Level 1 summary columns 
+                                        returned for every location, None
+                                        returns batchColumns
+        
+        @return closest_df      - Dataframe, one row per point and location
+                                        'Point' ( index of the point ), 
+                                        'Point latitude', 'Point longitude',
+                                        'Rank' ( 1 = closest ), 'Distance(km)'
+                                        and the summary columns, a point
+                                        without a finite Latitude and 
+                                        Longitude has empty columns and a
+                                        NaN distance
+        '''
+        if columns is None:
+            columns = closestLatLon.batchColumns
+        summary_df = pd.read_pickle( closestLatLon.summaryPath( currentDirectory ) )
+        spatialIndex = closestLatLon.loadSpatialIndex( currentDirectory )
+        lat1 = np.asarray( lat1 , dtype = np.float64 ).ravel()
+        lon1 = np.asarray( lon1 , dtype = np.float64 ).ravel()
+        rows , distances = closestLatLon.nearestSitesBatch( spatialIndex , lat1 , lon1 , k )
+        k = rows.shape[1]
+        # Points without a finite Latitude and Longitude ( row -1 ) get empty columns
+        closest_df = summary_df.loc[ : , columns ].reset_index( drop = True ).reindex( rows.ravel() )
+        closest_df = closest_df.reset_index( drop = True )
+        closest_df.insert( 0 , 'Point' , np.repeat( np.arange( len( lat1 ) ) , k ) )
+        closest_df.insert( 1 , 'Point latitude' , np.repeat( lat1 , k ) )
+        closest_df.insert( 2 , 'Point longitude' , np.repeat( lon1 , k ) )
+        closest_df.insert( 3 , 'Rank' , np.tile( np.arange( 1 , k + 1 ) , len( lat1 ) ) )
+        closest_df.insert( 4 , 'Distance(km)' , distances.ravel() )
+        return closest_df
+    
+    
+    
+    def closestLocationsCSV( currentDirectory , inputCSV , outputCSV = None , k = 1 ,
+                             columns = None , latColumn = 'Latitude' , lonColumn = 'Longitude' ):
+        '''
+        EXECUTION FUNCTION
+        
+        closestLocationsCSV()
+        
+        Find the k closest locations of every point of interest of a CSV file,
+        see closestLocationsBatch().  The other columns of the CSV file are
+        kept in front of the results of every point.
+        
+        @param currentDirectory - String, of the current working directory
+        @param inputCSV         - String, path of the CSV file of points
+        @param outputCSV        - String, path of the CSV file to write, None 
+                                        does not write a file
+        @param k                - int, number of closest locations of every point
+        @param columns          - List of Strings, Level 1 summary columns 
+                                        returned for every location, None
+                                        returns batchColumns
+        @param latColumn        - String, latitude column of the CSV file
+        @param lonColumn        - String, longitude column of the CSV file
+        
+        @return closest_df      - Dataframe, see closestLocationsBatch()
+        '''
+        points_df = pd.read_csv( inputCSV )
+        closest_df = closestLatLon.closestLocationsBatch( currentDirectory ,
+                                                          points_df[ latColumn ].values ,
+                                                          points_df[ lonColumn ].values ,
+                                                          k ,
+                                                          columns )
+        # Repeat the input row of every point for each of its locations
+        points_df = points_df.drop( [ latColumn , lonColumn ] , axis = 1 )
+        points_df = points_df.iloc[ closest_df['Point'].values ].reset_index( drop = True )
+        closest_df = pd.concat( [ points_df , closest_df ] , axis = 1 )
+        if outputCSV is not None:
+            closest_df.to_csv( outputCSV , index = False )
+        return closest_df
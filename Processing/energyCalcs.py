@@ -12,6 +12,17 @@ import math
 
 class energyCalcs:
 
+    # Sandia (King) module temperature model parameters of every mounting 
+    # configuration ( mount type , a , b , deltaT ), same values as pvlib.
+    # Add a row to process a new racking model, the order is the column order
+    # of the level 1 frame
+    sapmMountTypes = [ ( 'open_rack_cell_glassback' ,         -3.47 , -.0594 , 3 ) ,
+                       ( 'roof_mount_cell_glassback' ,        -2.98 , -.0471 , 1 ) ,
+                       ( 'open_rack_cell_polymerback' ,       -3.56 , -.0750 , 3 ) ,
+                       ( 'insulated_back_polymerback' ,       -2.81 , -.0455 , 0 ) ,
+                       ( 'open_rack_polymer_thinfilm_steel' , -3.58 , -.113 ,  3 ) ,
+                       ( '22x_concentrator_tracker' ,         -3.23 , -.130 ,  13 ) ]
+
     def power( cellTemp ):
         '''
         HELPER FUNCTION
@@ -29,6 +40,21 @@ class energyCalcs:
         
         
         
+    def powerArray( cellTemp ):
+        '''
+        HELPER FUNCTION
+        
+        Array version of power(), find the power produced from a solar module
+        for a whole column of cell temperatures at once.
+        
+        @param cellTemp           -numpy array, Cell Temperature of a solar module (C)
+
+        @return numpy array, power produced from a module (NEED TO ADD METRIC)  
+        '''
+        return ( ( 25 - np.asarray( cellTemp , dtype = float ) ) * .4 ) + 1
+        
+        
+        
         
     def rateOfDegEnv( poa, x, cellTemp, refTemp, mult):
         '''
@@ -53,6 +79,28 @@ class energyCalcs:
 
 
 
+    def rateOfDegEnvArray( poa, x, cellTemp, refTemp, mult):
+        '''
+        HELPER FUNCTION
+        
+        Array version of rateOfDegEnv(), find the rate of degradation kenetics 
+        using the Fischer model for whole columns of irradiance and 
+        temperature at once.
+        
+        @param poa           -numpy array, (Global) Plan of Array irradiance (W/m^2)
+        @param x             -float, fit parameter
+        @param cellTemp      -numpy array, solar module cell temperature (C)
+        @param refTemp       -float, reference temperature (C)
+        @param mult          -float, multiplier for the increase in degradation
+                                     for every 10(C) temperature increase
+        @return  numpy array, degradation rate (NEED TO ADD METRIC)  
+        '''
+        poa = np.asarray( poa , dtype = float )
+        cellTemp = np.asarray( cellTemp , dtype = float )
+        return np.power( poa , x ) * np.power( mult , ( cellTemp - refTemp ) / 10 )
+
+
+
     def rateOfDegChamber( x ):
         '''
         HELPER FUNCTION
@@ -112,6 +160,35 @@ class energyCalcs:
                     285)**4)*(1 - (n/8))) + (0.06 * (tD - tA ) ) * ( 1 + 100 * \
                     ( 1 - np.exp( - ( windSpeed / windSpeedCutOff)**20 ) ) ) ) 
         return dewYield
+
+
+
+    def dewYieldArray( h , tD , tA , windSpeed , n ):
+        '''
+        HELPER FUNCTION
+        
+        Array version of dewYield(), find the dew yield in (mm·d−1) for whole 
+        columns of weather data at once instead of calling the jitted scalar
+        function once per row.
+        
+        @param h          -float, site elevation in kilometers
+        @param tD         -numpy array, Dewpoint temperature in Celsius
+        @param tA         -numpy array, air temperature "dry bulb temperature"
+        @param windSpeed  -numpy array, air or windspeed measure in m*s^-1  or m/s
+        @param n          -numpy array, Total sky cover(okta)
+        @return  dewYield -numpy array, amount of dew yield in (mm·d−1)  
+        '''
+        tD = np.asarray( tD , dtype = float )
+        tA = np.asarray( tA , dtype = float )
+        windSpeed = np.asarray( windSpeed , dtype = float )
+        n = np.asarray( n , dtype = float )
+        windSpeedCutOff = 4.4 
+        dewYield = ( 1/12 ) * (.37 * ( 1 + ( 0.204323 * h ) - (0.0238893 * \
+                    h**2 ) - ( 18.0132 - ( 1.04963 * h**2 ) + ( 0.21891 * \
+                    h**2 ) ) * (10**( -3 ) * tD ) ) * ( ( ( ( tD + 273.15)/ \
+                    285)**4)*(1 - (n/8))) + (0.06 * (tD - tA ) ) * ( 1 + 100 * \
+                    ( 1 - np.exp( - ( windSpeed / windSpeedCutOff)**20 ) ) ) ) 
+        return dewYield
     
     
 
@@ -135,6 +212,29 @@ class energyCalcs:
                 ( 7.983632E-02 * dewPtTemp ) - 
                 ( 5.698355E-1)))
     
+    
+    
+    def waterVaporPressureArray( dewPtTemp ):
+        '''
+        HELPER FUNCTION
+        
+        waterVaporPressureArray()
+        
+        Array version of waterVaporPressure(), find the water vapor pressure 
+        (kPa) of a whole column of Dew Point Temperatures at once.
+        
+        @param dewPtTemp          -numpy array, Dew Point Temperature
+        @return                   -numpy array, water vapor pressure in kPa
+        '''
+        dewPtTemp = np.asarray( dewPtTemp , dtype = float )
+        return( np.exp(( 3.257532E-13 * dewPtTemp**6 ) - 
+                ( 1.568073E-10 * dewPtTemp**6 ) + 
+                ( 2.221304E-08 * dewPtTemp**4 ) + 
+                ( 2.372077E-7 * dewPtTemp**3) - 
+                ( 4.031696E-04 * dewPtTemp**2) + 
+                ( 7.983632E-02 * dewPtTemp ) - 
+                ( 5.698355E-1)))
+    
    
     
     def rH_Above85( rH ):    
@@ -174,6 +274,92 @@ class energyCalcs:
         
   
 
+    def hoursRH_Above85Array( rH ):      
+        '''
+        HELPER FUNCTION
+        
+        hoursRH_Above85Array()
+        
+        Array version of hoursRH_Above85(), count the number of hours relative
+        humidity is above 85% without testing every row in python.  
+        
+        @param    rH     -numpy array, Relative Humidity %
+        @return          -int, number of hours relative humidity is above 85%
+        
+        '''
+        return( int( np.count_nonzero( np.asarray( rH , dtype = float ) > 85 ) ) )
+        
+  
+
+    # Numba Machine Language Level ( Fast Processing )
+    @jit(nopython=True , error_model = 'python')
+    def sapmTemperatureKernel( poa , windSpeed , airTemp , a , b , deltaT , out ):
+        '''
+        HELPER FUNCTION
+        
+        sapmTemperatureKernel()
+        
+        Fill the cell and module temperature of every mounting configuration 
+        in one pass over the hourly data.
+        
+        temp_module = poa * exp( a + b * windSpeed ) + airTemp
+        temp_cell   = temp_module + ( poa / 1000 ) * deltaT
+        
+        @param poa        -numpy array, Plane of array irradiance (W/m^2)
+        @param windSpeed  -numpy array, wind speed (m/s)
+        @param airTemp    -numpy array, air temperature (C)
+        @param a          -numpy array, a parameter of every mount type
+        @param b          -numpy array, b parameter of every mount type
+        @param deltaT     -numpy array, deltaT parameter of every mount type
+        @param out        -2D numpy array, ( hours , 2 * mount types ) filled 
+                                with cell temperature, module temperature 
+                                of each mount type
+        
+        @return out       -2D numpy array, the filled output array
+        '''
+        for i in range( poa.shape[0] ):
+            for j in range( a.shape[0] ):
+                moduleTemp = poa[i] * np.exp( a[j] + b[j] * windSpeed[i] ) + airTemp[i]
+                out[i , 2 * j] = moduleTemp + ( poa[i] / 1000. ) * deltaT[j]
+                out[i , 2 * j + 1] = moduleTemp
+        return out
+    
+    
+
+    def sapmTemperatures( poa , windSpeed , airTemp , mountTypes = None ):
+        '''
+        HELPER FUNCTION
+        
+        sapmTemperatures()
+        
+        Calculate the cell and module temperature of every mounting 
+        configuration with the Sandia (King) model.  Replaces one 
+        pvlib.pvsystem.sapm_celltemp() call per mount type.
+        
+        @param poa         -numpy array, Plane of array irradiance (W/m^2)
+        @param windSpeed   -numpy array, wind speed (m/s)
+        @param airTemp     -numpy array, air temperature (C)
+        @param mountTypes  -list of tuples, ( mount type , a , b , deltaT ), 
+                                defaults to energyCalcs.sapmMountTypes
+        
+        @return            -2D numpy array, ( hours , 2 * mount types ) the 
+                                columns are cell temperature then module 
+                                temperature of each mount type in order
+        '''
+        if mountTypes is None:
+            mountTypes = energyCalcs.sapmMountTypes
+        poa = np.ascontiguousarray( poa , dtype = np.float64 )
+        out = np.empty( ( poa.shape[0] , 2 * len( mountTypes ) ) , dtype = np.float64 )
+        return energyCalcs.sapmTemperatureKernel( poa ,
+                                   np.ascontiguousarray( windSpeed , dtype = np.float64 ) ,
+                                   np.ascontiguousarray( airTemp , dtype = np.float64 ) ,
+                                   np.array( [ mount[1] for mount in mountTypes ] , dtype = np.float64 ) ,
+                                   np.array( [ mount[2] for mount in mountTypes ] , dtype = np.float64 ) ,
+                                   np.array( [ mount[3] for mount in mountTypes ] , dtype = np.float64 ) ,
+                                   out )
+    
+    
+
     def whToGJ( wh ):
         '''
         HELPER FUNCTION
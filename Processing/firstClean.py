@@ -91,8 +91,13 @@ class firstClean:
         @return level_1_df           -dataframe, return a cleaned dataframe
         
         '''
-        level_1_df = raw_df.loc[:,['Date (MM/DD/YYYY)', 
-                                   'Time (HH:MM)',
+        # EPW raw data already has the Local Date Time as datetimes, 
+        #    TMY3 raw data has Date and Time strings
+        if 'Local Date Time' in raw_df.columns:
+            dateTimeColumns = ['Local Date Time']
+        else:
+            dateTimeColumns = ['Date (MM/DD/YYYY)', 'Time (HH:MM)']
+        level_1_df = raw_df.loc[:,dateTimeColumns + [
                                    'Albedo',
                                    'Global horizontal irradiance',
                                    'Direct normal irradiance',
@@ -117,26 +122,33 @@ class firstClean:
         ################         
         #Create Date Time objects as columns, this includes finding Solar Time
         ################       
-        #Create a data frame to store a combined string frame of Date column and Time column
-        DateTimeStrings = level_1_df['Date (MM/DD/YYYY)'].str.cat(level_1_df['Time (HH:MM)'],sep=" ")
-        # Create a new column of the level_1_df named Local Date Time
-        # Use the DateTimeStrings frame to convert to a date time objects
-        # Store the new date time objects into the Local Date Time column
-        #Note: The my_to_datetime() will correct 24:00 to the next day at 0:00
-        level_1_df['Local Date Time'] = DateTimeStrings.apply(lambda x: firstClean.my_to_datetime(x))
+        if 'Local Date Time' not in level_1_df.columns:
+            #Create a data frame to store a combined string frame of Date column and Time column
+            DateTimeStrings = level_1_df['Date (MM/DD/YYYY)'].str.cat(level_1_df['Time (HH:MM)'],sep=" ")
+            # Create a new column of the level_1_df named Local Date Time
+            # All of the strings are parsed in one call. The raw data references 
+            #     24:00, so those stamps are changed to 00:00 and rolled over to the next day
+            #     (the same correction as my_to_datetime() but for the whole column)
+            hour24 = DateTimeStrings.str[11:13] == '24'
+            DateTimeStrings = DateTimeStrings.where( ~hour24 , 
+                                                     DateTimeStrings.str[0:11] + '00' + DateTimeStrings.str[13:] )
+            level_1_df['Local Date Time'] = pd.to_datetime( DateTimeStrings , format='%m/%d/%Y %H:%M' ) + \
+                                            pd.to_timedelta( hour24.astype(int) , unit = 'D' )
+            # Drop the old Date and Time (Strings) columns
+            level_1_df = level_1_df.drop(columns=['Date (MM/DD/YYYY)', 'Time (HH:MM)' ])
         # Correct the datetime object to universal time
-        # Use the helper method universalTimeCorrected() to process each local 
-        #     date time object
+        # Shift the whole column with a single timedelta, see universalTimeCorrected()
         # Create a new column in the level_1_df to store the Universal Date time object
-        level_1_df['Universal Date Time'] = level_1_df['Local Date Time'].apply(lambda x: firstClean.universalTimeCorrected(x, hoursAheadOrBehind))
+        level_1_df['Universal Date Time'] = level_1_df['Local Date Time'] - pd.Timedelta( hours = hoursAheadOrBehind )
         #Calculate the Local Solar time
-        # Use the localTimeToSolarTime() helper method
-        # Create a new column in the level_1_df to store the Universal Date time object
-        level_1_df['Local Solar Time'] = level_1_df.apply(lambda x: solarTime.localTimeToSolarTime( longitude , hoursAheadOrBehind , x['Local Date Time']), axis=1)
-        #Create another column of the hourly numeric Local Solar Time
-        level_1_df['Hourly Local Solar Time'] = level_1_df['Local Solar Time'].apply(lambda x: x.hour + (x.minute/60)) 
-        # Drop the old Date and Time (Strings) columns
-        level_1_df = level_1_df.drop(columns=['Date (MM/DD/YYYY)', 'Time (HH:MM)' ])
+        # Use the localTimeToSolarTimeArray() helper method to process the whole column
+        # Create a new column in the level_1_df to store the Local Solar Time
+        #     and another column of the hourly numeric Local Solar Time
+        solarTimes , hourlySolarTime = solarTime.localTimeToSolarTimeArray( longitude , 
+                                                                            hoursAheadOrBehind , 
+                                                                            level_1_df['Local Date Time'].values )
+        level_1_df['Local Solar Time'] = solarTimes.values
+        level_1_df['Hourly Local Solar Time'] = hourlySolarTime
         # Re index the column headings in a more organized format 
         level_1_df = level_1_df.reindex(columns = ['Local Date Time',
                                                    'Universal Date Time',
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Consolidated hourly data of every site.
+
+After the Level 1 processing the hourly data of all sites is copied into one
+memory mapped .npy array shaped ( sites , 8760 hours , variables ) of
+float32.  A site index sidecar pickle records which site is stored in each
+row and which Level 1 column is stored in each variable so cross site
+questions become array slices instead of thousands of file opens.
+
+EXAMPLE: maximum module temperature of every site in July
+
+    cube , siteIndex_df , variables = hourlyCube.loadHourlyCube( currentDirectory )
+    column = variables.index( 'Module Temperature(open_rack_cell_glassback)(C)' )
+    julyMax = np.nanmax( cube[ : , hourlyCube.monthHours( 7 ) , column ] , axis = 1 )
+
+@author: Derek Holsapple
+"""
+
+import os
+import pickle
+import pandas as pd
+import numpy as np
+from numpy.lib.format import open_memmap
+
+#For XLwings ref
+from Processing.level1Store import level1Store
+
+
+
+class hourlyCube:
+
+    # Number of hours in a year of TMY data
+    hoursPerYear = 8760
+
+
+
+    def cubePath( currentDirectory ):
+        '''
+        HELPER FUNCTION
+
+        cubePath()
+
+        @param currentDirectory  -String, of current working directory
+
+        @return                  -String, path of the memory mapped hourly cube
+        '''
+        return currentDirectory + '\\Pandas_Pickle_DataFrames\\Pickle_Level1_Cube\\hourlyCube.npy'
+
+
+
+    def siteIndexPath( currentDirectory ):
+        '''
+        HELPER FUNCTION
+
+        siteIndexPath()
+
+        @param currentDirectory  -String, of current working directory
+
+        @return                  -String, path of the site index sidecar pickle
+        '''
+        return currentDirectory + '\\Pandas_Pickle_DataFrames\\Pickle_Level1_Cube\\hourlyCubeIndex.pickle'
+
+
+
+    def monthHours( month ):
+        '''
+        HELPER FUNCTION
+
+        monthHours()
+
+        Hours of a month along the hour axis of the cube.  Hour 0 of the TMY
+        data is January 1st 01:00 local time and the hours of a day run from
+        01:00 to 24:00, so hour 24:00 is kept in the day ( and month ) it ends.
+
+        @param month     -int, month of the year (1-12)
+
+        @return          -slice, hours of the month
+        '''
+        # Start of every hour, 01:00 -> 00:00 ... 24:00 -> 23:00 of the same day
+        hourStarts = pd.date_range( '2001-01-01 00:00' , periods = hourlyCube.hoursPerYear , freq = 'h' )
+        hours = np.nonzero( hourStarts.month == month )[0]
+        return slice( int( hours[0] ) , int( hours[-1] ) + 1 )
+
+
+
+    def createHourlyCube( currentDirectory , variables = None ):
+        '''
+        EXECUTION FUNCTION
+
+        createHourlyCube()
+
+        Copy the Level 1 hourly data of every site into one memory mapped
+        array.  Sites are stored in the order of the Level 1 summary frame.
+        Must be run after finalOutputFrame.level_1_df_toPickle()
+
+        @param currentDirectory  -String, of current working directory
+        @param variables         -String List, Level 1 columns to store, None
+                                        stores every numeric column of the
+                                        first site
+
+        @return                  -void, stores hourlyCube.npy and
+                                        hourlyCubeIndex.pickle into
+                                        \Pandas_Pickle_DataFrames\Pickle_Level1_Cube
+        '''
+        summary_df = pd.read_pickle( currentDirectory + '\\Pandas_Pickle_DataFrames\\' + \
+                                     'Pickle_Level1_Summary\\Pickle_Level1_Summary.pickle' )
+        siteIndex_df = summary_df.loc[ : , [ 'Site Identifier Code' ,
+                                             'FilePath' ,
+                                             'Station name' ,
+                                             'Site latitude' ,
+                                             'Site longitude' ] ].reset_index( drop = True )
+        fileNames = siteIndex_df['FilePath'].tolist()
+        if len( fileNames ) == 0:
+            raise ValueError( 'No sites in the Level 1 summary, run the Level 1 processing first' )
+        if variables is None:
+            # Every numeric column, the date time columns are the same hours for every site
+            locationData , level_1_df = level1Store.readLevel1( currentDirectory , fileNames[0] )
+            variables = [ column for column in level_1_df.columns
+                          if np.issubdtype( level_1_df[column].dtype , np.number ) ]
+        if not os.path.exists( currentDirectory + '\\Pandas_Pickle_DataFrames\\Pickle_Level1_Cube' ):
+            os.makedirs( currentDirectory + '\\Pandas_Pickle_DataFrames\\Pickle_Level1_Cube' )
+        cube = open_memmap( hourlyCube.cubePath( currentDirectory ) ,
+                            mode = 'w+' ,
+                            dtype = np.float32 ,
+                            shape = ( len( fileNames ) , hourlyCube.hoursPerYear , len( variables ) ) )
+        for i in range( 0 , len( fileNames ) ):
+            locationData , level_1_df = level1Store.readLevel1( currentDirectory , fileNames[i] , variables )
+            values = level_1_df.values[ : hourlyCube.hoursPerYear ].astype( np.float32 )
+            # Missing hours are stored as NaN
+            cube[ i ] = np.nan
+            cube[ i , : values.shape[0] ] = values
+        cube.flush()
+        del cube
+        with open( hourlyCube.siteIndexPath( currentDirectory ) , 'wb' ) as f:
+            pickle.dump( ( siteIndex_df , variables ) , f )
+
+
+
+    def loadHourlyCube( currentDirectory , mode = 'r' ):
+        '''
+        EXECUTION FUNCTION
+
+        loadHourlyCube()
+
+        Open the hourly cube without reading it into memory.  Only the slices
+        used are read from disk.
+
+        @param currentDirectory  -String, of current working directory
+        @param mode              -String, memory map mode, 'r' read only
+
+        @return cube             -numpy memmap, ( sites , 8760 hours , variables )
+        @return siteIndex_df     -Dataframe, site stored in each row of the cube
+        @return variables        -String List, Level 1 column stored in each
+                                        variable of the cube
+        '''
+        cube = np.load( hourlyCube.cubePath( currentDirectory ) , mmap_mode = mode )
+        with open( hourlyCube.siteIndexPath( currentDirectory ) , 'rb' ) as f:
+            siteIndex_df , variables = pickle.load( f )
+        return cube , siteIndex_df , variables
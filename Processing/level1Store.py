@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Storage of the processed Level 1 site frames.
+
+Each site is stored in \Pandas_Pickle_DataFrames\Pickle_Level1 either as a
+pickled ( locationData , level_1_df ) tuple or, when pyarrow is installed,
+as a Parquet file.  The Parquet files store the hourly data as typed
+float32/datetime64 columns and the site location data in the file footer so
+a plot only has to read the columns it displays.
+
+@author: Derek Holsapple
+"""
+
+import os
+import json
+import pandas as pd
+import numpy as np
+
+# pyarrow is optional, only needed for the Parquet store
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+
+class level1Store:
+
+    # Supported store formats and the file extension that replaces .pickle
+    formatExtensions = { 'pickle' : '.pickle' ,
+                         'parquet' : '.parquet' }
+
+
+
+    def parquetAvailable():
+        '''
+        HELPER FUNCTION
+
+        parquetAvailable()
+
+        Determine if pyarrow is installed and the Parquet store can be used
+
+        @return     -Boolean, True if the Parquet store can be used
+        '''
+        return pq is not None
+
+
+
+    def checkFormat( storeFormat ):
+        '''
+        HELPER FUNCTION
+
+        checkFormat()
+
+        Raise an error if the store format is unknown or its package is not
+        installed.  Called before processing so a run does not fail half way.
+
+        @param storeFormat   -String, 'pickle' or 'parquet'
+
+        @return              -void
+        '''
+        if storeFormat not in level1Store.formatExtensions:
+            raise ValueError( 'Unknown Level 1 store format: ' + str( storeFormat ) )
+        if storeFormat == 'parquet' and not level1Store.parquetAvailable():
+            raise ImportError( 'pyarrow is required to store or read Level 1 data as Parquet' )
+
+
+
+    def level1Path( currentDirectory , fileName , storeFormat = 'pickle' ):
+        '''
+        HELPER FUNCTION
+
+        level1Path()
+
+        Path of the Level 1 file of a site in the given store format
+
+        @param currentDirectory  -String, of current working directory
+        @param fileName          -String, file name of the raw pickle of the site
+        @param storeFormat       -String, 'pickle' or 'parquet'
+
+        @return                  -String, path of the Level 1 file
+        '''
+        baseName = fileName
+        if baseName.endswith( '.pickle' ):
+            baseName = baseName[ : -len( '.pickle' ) ]
+        return currentDirectory + '\\Pandas_Pickle_DataFrames\\Pickle_Level1\\' + \
+               baseName + level1Store.formatExtensions[ storeFormat ]
+
+
+
+    def exists( currentDirectory , fileName , storeFormat = 'pickle' ):
+        '''
+        HELPER FUNCTION
+
+        exists()
+
+        Determine if the Level 1 file of a site exists in the given store format
+
+        @param currentDirectory  -String, of current working directory
+        @param fileName          -String, file name of the raw pickle of the site
+        @param storeFormat       -String, 'pickle' or 'parquet'
+
+        @return                  -Boolean, True if the file exists
+        '''
+        return os.path.isfile( level1Store.level1Path( currentDirectory , fileName , storeFormat ) )
+
+
+
+    def remove( currentDirectory , fileName ):
+        '''
+        HELPER FUNCTION
+
+        remove()
+
+        Delete the Level 1 files of a site in every store format
+
+        @param currentDirectory  -String, of current working directory
+        @param fileName          -String, file name of the raw pickle of the site
+
+        @return                  -void
+        '''
+        for storeFormat in level1Store.formatExtensions:
+            if level1Store.exists( currentDirectory , fileName , storeFormat ):
+                os.remove( level1Store.level1Path( currentDirectory , fileName , storeFormat ) )
+
+
+
+    def writeLevel1( currentDirectory , fileName , locationData , level_1_df , storeFormat = 'pickle' ):
+        '''
+        HELPER FUNCTION
+
+        writeLevel1()
+
+        Store the Level 1 data of a site.  The file of the other store format
+        is deleted so a site only has one current Level 1 file.
+
+        @param currentDirectory  -String, of current working directory
+        @param fileName          -String, file name of the raw pickle of the site
+        @param locationData      -Series, site location data
+        @param level_1_df        -Dataframe, Level 1 hourly data of the site
+        @param storeFormat       -String, 'pickle' or 'parquet'
+
+        @return                  -void, stores the data into
+                                    \Pandas_Pickle_DataFrames\Pickle_Level1
+        '''
+        level1Store.checkFormat( storeFormat )
+        level1Store.remove( currentDirectory , fileName )
+        path = level1Store.level1Path( currentDirectory , fileName , storeFormat )
+        if storeFormat == 'pickle':
+            pd.to_pickle( ( locationData , level_1_df ) , path )
+            return
+        # Store the hourly floats as float32, times stay datetime64
+        table_df = level_1_df.copy()
+        for column in table_df.columns:
+            if table_df[column].dtype == np.float64:
+                table_df[column] = table_df[column].astype( np.float32 )
+        table = pa.Table.from_pandas( table_df , preserve_index = False )
+        # The site location data is kept in the footer of the file
+        metadata = dict( table.schema.metadata or {} )
+        metadata[ b'locationData' ] = json.dumps(
+                { 'index' : [ str( x ) for x in locationData.index ] ,
+                  'values' : [ x.item() if hasattr( x , 'item' ) else x for x in locationData.values ] } ,
+                default = str ).encode( 'utf-8' )
+        table = table.replace_schema_metadata( metadata )
+        pq.write_table( table , path , compression = 'snappy' )
+
+
+
+    def readLocationData( path ):
+        '''
+        HELPER FUNCTION
+
+        readLocationData()
+
+        Read the site location data from the footer of a Parquet Level 1 file
+        without reading any of the hourly data
+
+        @param path        -String, path of the Parquet file
+
+        @return            -Series, site location data
+        '''
+        locationData = json.loads( pq.read_schema( path ).metadata[ b'locationData' ].decode( 'utf-8' ) )
+        return pd.Series( locationData['values'] , index = locationData['index'] )
+
+
+
+    def readLevel1( currentDirectory , fileName , columns = None ):
+        '''
+        HELPER FUNCTION
+
+        readLevel1()
+
+        Read the Level 1 data of a site from whichever store format exists.
+        When the site is stored as Parquet only the requested columns are read.
+
+        @param currentDirectory  -String, of current working directory
+        @param fileName          -String, file name of the raw pickle of the site
+        @param columns           -String List, columns of the level 1 frame to
+                                        read, None reads every column
+
+        @return data_tuple       -tuple, ( locationData , level_1_df )
+                                    Series of site location data and
+                                    Dataframe of the Level 1 hourly data
+        '''
+        if level1Store.parquetAvailable() and \
+                level1Store.exists( currentDirectory , fileName , 'parquet' ):
+            path = level1Store.level1Path( currentDirectory , fileName , 'parquet' )
+            level_1_df = pq.read_table( path , columns = columns ).to_pandas()
+            return level1Store.readLocationData( path ) , level_1_df
+        # A site stored only as Parquet can not be read without pyarrow
+        if not level1Store.exists( currentDirectory , fileName , 'pickle' ) and \
+                level1Store.exists( currentDirectory , fileName , 'parquet' ):
+            level1Store.checkFormat( 'parquet' )
+        locationData , level_1_df = pd.read_pickle(
+                level1Store.level1Path( currentDirectory , fileName , 'pickle' ) )
+        if columns is not None:
+            level_1_df = level_1_df.loc[ : , columns ]
+        return locationData , level_1_df
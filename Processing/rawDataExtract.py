@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+Selective extraction of the raw weather files.
+
+The RawData tree is walked once.  Only the .csv and .epw files are copied or
+extracted ( from the .zip archives ) into Python_RawData_Combined and the
+archives are extracted concurrently.  A file whose size and modified time
+already match the destination is skipped so re-running the extraction after
+adding one archive only writes the files of that archive.
+
+@author: Derek Holsapple
+"""
+
+import os
+import time
+import shutil
+import zipfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+
+
+class rawDataExtract:
+
+    # Extensions of the raw weather files that are extracted ( lower case )
+    rawDataExtensions = ( '.csv' , '.epw' )
+
+
+
+    def isRawDataFile( fileName ):
+        '''
+        HELPER FUNCTION
+
+        isRawDataFile()
+
+        Determine if a file is a raw weather file ( .csv or .epw in any case )
+
+        @param fileName    -String, file name or path
+
+        @return            -Boolean, True if the file is a raw weather file
+        '''
+        return fileName.lower().endswith( rawDataExtract.rawDataExtensions )
+
+
+
+    def findRawSources( rawDataPath ):
+        '''
+        HELPER FUNCTION
+
+        findRawSources()
+
+        Walk the raw data tree once and sort out the archives and the raw
+        weather files
+
+        @param rawDataPath   -String, root directory of the raw data
+
+        @return zipFiles     -String List, paths of the .zip archives
+        @return rawFiles     -String List, paths of the .csv and .epw files
+        '''
+        zipFiles = []
+        rawFiles = []
+        for dirpath, subdirs, files in os.walk( rawDataPath ):
+            for x in files:
+                if x.lower().endswith( '.zip' ):
+                    zipFiles.append( os.path.join( dirpath , x ) )
+                elif rawDataExtract.isRawDataFile( x ):
+                    rawFiles.append( os.path.join( dirpath , x ) )
+        return sorted( zipFiles ) , sorted( rawFiles )
+
+
+
+    def resolveRawSources( zipFiles , rawFiles ):
+        '''
+        HELPER FUNCTION
+
+        resolveRawSources()
+
+        Decide which source is placed in the destination under every file
+        name.  The archives are flattened so two members ( or a member and a
+        loose file ) can share a file name.  The winner is the same as the
+        original extraction that overwrote in walk order: the archives in
+        findRawSources() order then the loose files, the last source of a
+        name wins.
+
+        @param zipFiles      -String List, paths of the .zip archives
+        @param rawFiles      -String List, paths of the .csv and .epw files
+                                    ( see findRawSources() )
+
+        @return winners      -Dictionary, file name : ( zipPath , member ) of
+                                    an archive member or ( None , filePath )
+                                    of a loose file, in walk order
+        @return duplicates   -List of tuples, ( file name , source kept ,
+                                    source skipped ) of every name found
+                                    more than once, sources as "archive
+                                    path|member name" or the file path
+        '''
+        sources = []
+        for zipPath in zipFiles:
+            with zipfile.ZipFile( zipPath , 'r' ) as zip_ref:
+                for member in zip_ref.infolist():
+                    if not member.is_dir() and rawDataExtract.isRawDataFile( member.filename ):
+                        sources.append( ( zipPath , member.filename ) )
+        sources = sources + [ ( None , filePath ) for filePath in rawFiles ]
+        winners = {}
+        skipped = {}
+        for source in sources:
+            name = os.path.basename( source[1] )
+            if name in winners:
+                skipped.setdefault( name , [] ).append( winners[ name ] )
+            winners[ name ] = source
+        duplicates = [ ( name ,
+                         rawDataExtract.sourceLabel( winners[ name ] ) ,
+                         rawDataExtract.sourceLabel( source ) )
+                       for name in skipped for source in skipped[ name ] ]
+        return winners , duplicates
+
+
+
+    def sourceLabel( source ):
+        '''
+        HELPER FUNCTION
+
+        sourceLabel()
+
+        @param source      -tuple, ( zipPath , member ) or ( None , filePath )
+
+        @return            -String, "archive path|member name" or the file path
+        '''
+        if source[0] is None:
+            return source[1]
+        return source[0] + '|' + source[1]
+
+
+
+    def isCurrent( destinationFile , size , mtime ):
+        '''
+        HELPER FUNCTION
+
+        isCurrent()
+
+        Determine if the destination file is already the same as its source.
+        Modified times are compared to the second, zip archives only store
+        the time to 2 seconds.
+
+        @param destinationFile  -String, path of the extracted file
+        @param size             -int, size of the source in bytes
+        @param mtime            -float, modified time of the source
+                                        ( seconds since the epoch )
+
+        @return                 -Boolean, True if the file can be skipped
+        '''
+        if not os.path.isfile( destinationFile ):
+            return False
+        return os.path.getsize( destinationFile ) == size and \
+               abs( os.path.getmtime( destinationFile ) - mtime ) < 2
+
+
+
+    def copyRawFile( filePath , destination ):
+        '''
+        HELPER FUNCTION
+
+        copyRawFile()
+
+        Copy a raw weather file into the destination directory unless it is
+        already current
+
+        @param filePath      -String, path of the raw weather file
+        @param destination   -String, directory of the combined raw data
+
+        @return names        -String List, file name placed in the destination
+        @return written      -int, 1 if the file was copied, 0 if skipped
+        '''
+        name = os.path.basename( filePath )
+        destinationFile = os.path.join( destination , name )
+        if not rawDataExtract.isCurrent( destinationFile ,
+                                         os.path.getsize( filePath ) ,
+                                         os.path.getmtime( filePath ) ):
+            # copy2 keeps the modified time so the next run can skip the file
+            shutil.copy2( filePath , destinationFile )
+            return [ name ] , 1
+        return [ name ] , 0
+
+
+
+    def extractArchive( zipPath , destination , members = None ):
+        '''
+        HELPER FUNCTION
+
+        extractArchive()
+
+        Extract the raw weather files of one archive into the destination
+        directory.  Other members are not extracted and the folders inside of
+        the archive are flattened.  A member is written to a temporary file
+        first so a file is never left half written.
+
+        @param zipPath       -String, path of the .zip archive
+        @param destination   -String, directory of the combined raw data
+        @param members       -Set of Strings, member names to extract, None
+                                    extracts every raw weather file
+
+        @return names        -String List, file names placed in the destination
+        @return written      -int, number of files extracted ( not skipped )
+        '''
+        names = []
+        written = 0
+        with zipfile.ZipFile( zipPath , 'r' ) as zip_ref:
+            for member in zip_ref.infolist():
+                if member.is_dir() or not rawDataExtract.isRawDataFile( member.filename ):
+                    continue
+                if members is not None and member.filename not in members:
+                    continue
+                name = os.path.basename( member.filename )
+                names.append( name )
+                destinationFile = os.path.join( destination , name )
+                mtime = time.mktime( member.date_time + ( 0 , 0 , -1 ) )
+                if rawDataExtract.isCurrent( destinationFile , member.file_size , mtime ):
+                    continue
+                handle , tempFile = tempfile.mkstemp( dir = destination , suffix = '.part' )
+                try:
+                    with os.fdopen( handle , 'wb' ) as target , zip_ref.open( member ) as source:
+                        shutil.copyfileobj( source , target , 1024 * 1024 )
+                    # Keep the modified time of the member so the next run can skip it
+                    os.utime( tempFile , ( mtime , mtime ) )
+                    os.replace( tempFile , destinationFile )
+                except BaseException:
+                    if os.path.exists( tempFile ):
+                        os.remove( tempFile )
+                    raise
+                written = written + 1
+        return names , written
+
+
+
+    def extractRawData( path , workers = None , removeStale = True ):
+        '''
+        EXECUTION FUNCTION
+
+        extractRawData()
+
+        Place every raw weather file of \RawData ( loose or inside of .zip
+        archives ) into \Python_RawData_Combined.  The tree is walked once and
+        the source of every file name is decided before any file is written
+        ( see resolveRawSources() ) so the threads never write the same file.
+        The archives and files are processed by a pool of threads ( the work
+        is file I/O and decompression ) and current files are skipped.
+
+        @param path          -String, current working directory
+        @param workers       -int, number of threads, None uses the
+                                    ThreadPoolExecutor default
+        @param removeStale   -Boolean, True deletes the .csv and .epw files of
+                                    the destination that no longer have a
+                                    source
+
+        @return sources      -int, number of archives and raw files found
+        @return written      -int, number of files extracted or copied
+        @return duplicates   -List of tuples, ( file name , source kept ,
+                                    source skipped ) see resolveRawSources()
+        '''
+        destination = path + '\\Python_RawData_Combined'
+        if not os.path.exists( destination ):
+            os.makedirs( destination )
+        zipFiles , rawFiles = rawDataExtract.findRawSources( path + '\\RawData' )
+        winners , duplicates = rawDataExtract.resolveRawSources( zipFiles , rawFiles )
+        # Members of every archive that won their file name
+        archiveMembers = {}
+        for source in winners.values():
+            if source[0] is not None:
+                archiveMembers.setdefault( source[0] , set() ).add( source[1] )
+        names = set()
+        written = 0
+        with ThreadPoolExecutor( max_workers = workers ) as executor:
+            jobs = [ executor.submit( rawDataExtract.extractArchive , zipPath , destination , members )
+                     for zipPath , members in archiveMembers.items() ] + \
+                   [ executor.submit( rawDataExtract.copyRawFile , source[1] , destination )
+                     for source in winners.values() if source[0] is None ]
+            for job in jobs:
+                jobNames , jobWritten = job.result()
+                names.update( jobNames )
+                written = written + jobWritten
+        if removeStale:
+            for item in os.listdir( destination ):
+                if rawDataExtract.isRawDataFile( item ) and item not in names:
+                    os.remove( os.path.join( destination , item ) )
+        return len( zipFiles ) + len( rawFiles ) , written , duplicates
@@ -22,9 +22,14 @@ import glob
 import pandas as pd
 import os 
 import io
+import csv
+import zipfile
 import pickle
+from concurrent.futures import ProcessPoolExecutor
 
 from Processing.cleanRawOutput  import cleanRawOutput
+from Processing.rawDataExtract  import rawDataExtract
+from Processing.siteIndex  import siteIndex
 #from cleanRawOutput  import cleanRawOutput
 
 try:
@@ -36,6 +41,160 @@ except ImportError:
 
 class rawDataImport:
 
+    # Separates the archive path and the member name of a raw data file read
+    #    directly from a .zip archive ( not a valid file name character )
+    zipMemberSeparator = '|'
+    # Columns of the site location data and the first row summary
+    firstRowColumns = ['Site Identifier Code',
+                       'Station name',
+                       'Station State', 
+                       'Site time zone (Universal time + or -)',
+                       'Site latitude', 
+                       'Site longitude',
+                       'Site elevation (meters)',
+                       'Station country or political unit',
+                       'WMO region',
+                       'Time zone code',
+                       'Koppen-Geiger climate classification']
+    # Columns of the first row summary stored as floats, the other columns 
+    #    are kept as read
+    firstRowFloatColumns = ['Site time zone (Universal time + or -)',
+                            'Site latitude', 
+                            'Site longitude',
+                            'Site elevation (meters)']
+    # Raw data columns firstClean.cleanedFrame() uses, compact raw data only
+    #    reads these columns
+    compactColumns = [ 'Local Date Time',
+                       'Date (MM/DD/YYYY)',
+                       'Time (HH:MM)',
+                       'Global horizontal irradiance',
+                       'Direct normal irradiance',
+                       'Diffuse horizontal irradiance',
+                       'Total sky cover',
+                       'Dry-bulb temperature',
+                       'Dew-point temperature',
+                       'Relative humidity',
+                       'Station pressure',
+                       'Wind direction',
+                       'Wind speed',
+                       'Albedo' ]
+    # Column maps of every raw data format
+    #    ( source column , raw data column , unit scale , dtype )
+    #    The unit scale multiplies the source column into the raw data units
+    #    ( None if the units are the same ).  The dtype is the typed dtype of 
+    #    compact raw data, None keeps the parsed dtype.  Source columns 
+    #    missing from a file are skipped and columns not listed are dropped.
+    # TMY3 CSV, the source column is the column position ( same positions 
+    #    for the 69 and 71 column files, the 2 extra present weather columns
+    #    of the 71 column files are dropped )
+    tmy3ColumnMap = [ ( 0 , 'Date (MM/DD/YYYY)' , None , str ),
+                      ( 1 , 'Time (HH:MM)' , None , str ),
+                      ( 2 , 'Hourly extraterrestrial radiation on a horizontal surface' , None , 'float32' ),
+                      ( 3 , 'Hourly extraterrestrial radiation normal to the sun' , None , 'float32' ),
+                      ( 4 , 'Global horizontal irradiance' , None , 'float32' ),
+                      ( 5 , 'Global horizontal irradiance source flag' , None , None ),
+                      ( 6 , 'Global horizontal irradiance uncertainty' , None , 'float32' ),
+                      ( 7 , 'Direct normal irradiance' , None , 'float32' ),
+                      ( 8 , 'Direct normal irradiance source flag' , None , None ),
+                      ( 9 , 'Direct normal irradiance uncertainty' , None , 'float32' ),
+                      ( 10 , 'Diffuse horizontal irradiance' , None , 'float32' ),
+                      ( 11 , 'Diffuse horizontal irradiance source flag' , None , None ),
+                      ( 12 , 'Diffuse horizontal irradiance uncertainty' , None , 'float32' ),
+                      ( 13 , 'Global horizontal illuminance' , None , 'float32' ),
+                      ( 14 , 'Global horizontal illuminance source flag' , None , None ),
+                      ( 15 , 'Global horizontal illuminance uncertainty' , None , 'float32' ),
+                      ( 16 , 'Direct normal illuminance' , None , 'float32' ),
+                      ( 17 , 'Direct normal illuminance source flag' , None , None ),
+                      ( 18 , 'Direct normal illuminance uncertainty' , None , 'float32' ),
+                      ( 19 , 'Diffuse horizontal illuminance' , None , 'float32' ),
+                      ( 20 , 'Diffuse horizontal illuminance source flag' , None , None ),
+                      ( 21 , 'Diffuse horizontal illuminance uncertainty' , None , 'float32' ),
+                      ( 22 , 'Zenith luminance' , None , 'float32' ),
+                      ( 23 , 'Zenith luminance source flag' , None , None ),
+                      ( 24 , 'Zenith luminance uncertainty' , None , 'float32' ),
+                      ( 25 , 'Total sky cover' , None , 'float32' ),
+                      ( 26 , 'Total sky cover (source)' , None , None ),
+                      ( 27 , 'Total sky cover (uncertainty)' , None , None ),
+                      ( 28 , 'Opaque sky cover' , None , 'float32' ),
+                      ( 29 , 'Opaque sky cover (source)' , None , None ),
+                      ( 30 , 'Opaque sky cover flag (uncertainty)' , None , None ),
+                      ( 31 , 'Dry-bulb temperature' , None , 'float32' ),
+                      ( 32 , 'Dry-bulb temperature flag (source)' , None , None ),
+                      ( 33 , 'Dry-bulb temperature flag (uncertainty)' , None , None ),
+                      ( 34 , 'Dew-point temperature' , None , 'float32' ),
+                      ( 35 , 'Dew-point temperature flag (source)' , None , None ),
+                      ( 36 , 'Dew-point temperature flag (uncertainty)' , None , None ),
+                      ( 37 , 'Relative humidity' , None , 'float32' ),
+                      ( 38 , 'Relative humidity flag (source)' , None , None ),
+                      ( 39 , 'Relative humidity flag (uncertainty)' , None , None ),
+                      ( 40 , 'Station pressure' , None , 'float32' ),
+                      ( 41 , 'Station pressure flag (source)' , None , None ),
+                      ( 42 , 'Station pressure flag (uncertainty)' , None , None ),
+                      ( 43 , 'Wind direction' , None , 'float32' ),
+                      ( 44 , 'Wind direction flag (source)' , None , None ),
+                      ( 45 , 'Wind direction flag (uncertainty)' , None , None ),
+                      ( 46 , 'Wind speed' , None , 'float32' ),
+                      ( 47 , 'Wind speed flag (source)' , None , None ),
+                      ( 48 , 'Wind speed flag (uncertainty)' , None , None ),
+                      ( 49 , 'Horizontal visibility' , None , 'float32' ),
+                      ( 50 , 'Horizontal visibility flag (source)' , None , None ),
+                      ( 51 , 'Horizontal visibility flag (uncertainty)' , None , None ),
+                      ( 52 , 'Ceiling height' , None , 'float32' ),
+                      ( 53 , 'Ceiling height flag (source)' , None , None ),
+                      ( 54 , 'Ceiling height flag (uncertainty)' , None , None ),
+                      ( 55 , 'Precipitable water' , None , 'float32' ),
+                      ( 56 , 'Precipitable water flag (source)' , None , None ),
+                      ( 57 , 'Precipitable water flag (uncertainty)' , None , None ),
+                      # Data may contain NA
+                      ( 58 , 'Aerosol optical depth, broadband' , None , 'float32' ),
+                      ( 59 , 'Aerosol optical depth, broadband flag (source)' , None , None ),
+                      ( 60 , 'Aerosol optical depth, broadband flag (flag)' , None , None ),
+                      ( 61 , 'Albedo' , None , 'float32' ),
+                      ( 62 , 'Albedo flag (source)' , None , None ),
+                      ( 63 , 'Albedo flag (uncertainty)' , None , None ),
+                      ( 64 , 'Liquid percipitation depth' , None , 'float32' ),
+                      ( 65 , 'Liquid percipitation quantity' , None , 'float32' ),
+                      ( 66 , 'Liquid percipitation depth flag (source)' , None , None ),
+                      ( 67 , 'Liquid percipitation depth flag (uncertainty)' , None , None ),
+                      ( 68 , 'Present Weather' , None , None ) ]
+    # EPW, the source column is the read_epw() column ( 'Local Date Time' is
+    #    made from the datetime index ), pressure Pa to mbar, visibility km to m
+    epwColumnMap = [ ( 'Local Date Time' , 'Local Date Time' , None , None ),
+                     ( 'etr' , 'Hourly extraterrestrial radiation on a horizontal surface' , None , 'float32' ),
+                     ( 'etrn' , 'Hourly extraterrestrial radiation normal to the sun' , None , 'float32' ),
+                     ( 'ghi_infrared' , 'Horizontal infrared radiation' , None , 'float32' ),
+                     ( 'ghi' , 'Global horizontal irradiance' , None , 'float32' ),
+                     ( 'dni' , 'Direct normal irradiance' , None , 'float32' ),
+                     ( 'dhi' , 'Diffuse horizontal irradiance' , None , 'float32' ),
+                     ( 'global_hor_illum' , 'Global horizontal illuminance' , None , 'float32' ),
+                     ( 'direct_normal_illum' , 'Direct normal illuminance' , None , 'float32' ),
+                     ( 'diffuse_horizontal_illum' , 'Diffuse horizontal illuminance' , None , 'float32' ),
+                     ( 'zenith_luminance' , 'Zenith luminance' , None , 'float32' ),
+                     ( 'total_sky_cover' , 'Total sky cover' , None , 'float32' ),
+                     ( 'opaque_sky_cover' , 'Opaque sky cover' , None , 'float32' ),
+                     ( 'temp_air' , 'Dry-bulb temperature' , None , 'float32' ),
+                     ( 'temp_dew' , 'Dew-point temperature' , None , 'float32' ),
+                     ( 'relative_humidity' , 'Relative humidity' , None , 'float32' ),
+                     ( 'atmospheric_pressure' , 'Station pressure' , .01 , 'float32' ),
+                     ( 'wind_direction' , 'Wind direction' , None , 'float32' ),
+                     ( 'wind_speed' , 'Wind speed' , None , 'float32' ),
+                     ( 'visibility' , 'Horizontal visibility' , 1000 , 'float32' ),
+                     ( 'ceiling_height' , 'Ceiling height' , None , 'float32' ),
+                     ( 'precipitable_water' , 'Precipitable water' , None , 'float32' ),
+                     ( 'aerosol_optical_depth' , 'Aerosol optical depth, broadband' , None , 'float32' ),
+                     ( 'albedo' , 'Albedo' , None , 'float32' ),
+                     ( 'liquid_precipitation_depth' , 'Liquid percipitation depth' , None , 'float32' ),
+                     ( 'liquid_precipitation_quantity' , 'Liquid percipitation quantity' , None , 'float32' ),
+                     ( 'present_weather_observation' , 'Present Weather Observations' , None , None ),
+                     ( 'present_weather_codes' , 'Present Weather Codes' , None , None ),
+                     ( 'snow_depth' , 'Snow Depth' , None , 'float32' ),
+                     ( 'days_since_last_snowfall' , 'Days Since Last Snowfall' , None , 'float32' ) ]
+    # EPW date columns : dtype, needed for the index of compact raw data
+    epwDateColumns = { 'year' : 'int16',
+                       'month' : 'int8',
+                       'day' : 'int8',
+                       'hour' : 'int8' }
+
     
     
     def rawFilesNamesList( path ):
@@ -88,320 +247,433 @@ class rawDataImport:
     
     
    
-    def RenameFrame(df):
+    def applyColumnMap( df , columnMap ):
         '''
         HELPER METHOD
         
-        cleanAndRenameFrame()
-        
-        Rename and clean a csv dataframe (raw data)
-        
-        @param df            -DataFrame, frame of raw data from csv file, uncleaned
-        
-        @return df           -DataFrame, cleaned and renamed frame                  
-        '''     
-        #Rename the columns of the frame
-        df.columns = ['Date (MM/DD/YYYY)', 
-                      'Time (HH:MM)',
-                      'Hourly extraterrestrial radiation on a horizontal surface',
-                      'Hourly extraterrestrial radiation normal to the sun',
-                      'Global horizontal irradiance',
-                      'Global horizontal irradiance source flag',
-                      'Global horizontal irradiance uncertainty',
-                      'Direct normal irradiance',
-                      'Direct normal irradiance source flag',
-                      'Direct normal irradiance uncertainty',
-                      'Diffuse horizontal irradiance',
-                      'Diffuse horizontal irradiance source flag',
-                      'Diffuse horizontal irradiance uncertainty',
-                      'Global horizontal illuminance',
-                      'Global horizontal illuminance source flag',
-                      'Global horizontal illuminance uncertainty',
-                      'Direct normal illuminance',
-                      'Direct normal illuminance source flag',
-                      'Direct normal illuminance uncertainty',
-                      'Diffuse horizontal illuminance',
-                      'Diffuse horizontal illuminance source flag',
-                      'Diffuse horizontal illuminance uncertainty',
-                      'Zenith luminance',
-                      'Zenith luminance source flag',
-                      'Zenith luminance uncertainty',
-                      'Total sky cover',
-                      'Total sky cover (source)',
-                      'Total sky cover (uncertainty)',
-                      'Opaque sky cover',
-                      'Opaque sky cover (source)',
-                      'Opaque sky cover flag (uncertainty)',
-                      'Dry-bulb temperature',
-                      'Dry-bulb temperature flag (source)',
-                      'Dry-bulb temperature flag (uncertainty)',
-                      'Dew-point temperature',
-                      'Dew-point temperature flag (source)',
-                      'Dew-point temperature flag (uncertainty)',
-                      'Relative humidity',
-                      'Relative humidity flag (source)',
-                      'Relative humidity flag (uncertainty)',
-                      'Station pressure',
-                      'Station pressure flag (source)',
-                      'Station pressure flag (uncertainty)',
-                      'Wind direction',
-                      'Wind direction flag (source)',
-                      'Wind direction flag (uncertainty)',
-                      'Wind speed',
-                      'Wind speed flag (source)',
-                      'Wind speed flag (uncertainty)',
-                      'Horizontal visibility',
-                      'Horizontal visibility flag (source)',
-                      'Horizontal visibility flag (uncertainty)',
-                      'Ceiling height',
-                      'Ceiling height flag (source)',
-                      'Ceiling height flag (uncertainty)',
-                      'Precipitable water',
-                      'Precipitable water flag (source)',
-                      'Precipitable water flag (uncertainty)',
-                      
-                      # Data may contain NA 
-                      ######
-                      'Aerosol optical depth, broadband',
-                      'Aerosol optical depth, broadband flag (source)',
-                      'Aerosol optical depth, broadband flag (flag)',
-                      'Albedo',
-                      'Albedo flag (source)',
-                      'Albedo flag (uncertainty)',
-                      ######
-                      
-                      'Liquid percipitation depth',
-                      'Liquid percipitation quantity',
-                      'Liquid percipitation depth flag (source)',
-                      'Liquid percipitation depth flag (uncertainty)',
-                      'Present Weather']
-        return df
-
+        applyColumnMap()
+        
+        Build the raw data frame from the frame read from a raw data file in 
+        one pass.  Every column of the map found in the frame is renamed and 
+        scaled to the raw data units as a whole column, unscaled columns are 
+        not copied.  Columns that are not in the map are dropped.
+        
+        @param df          -DataFrame, frame read from the raw data file
+        @param columnMap   -List of tuples, ( source column , raw data column , 
+                                unit scale , dtype ) see tmy3ColumnMap
+        
+        @return df         -DataFrame, renamed and scaled raw data frame
+        '''
+        columns = {}
+        for source , target , scale , dtype in columnMap:
+            if source not in df.columns:
+                continue
+            if scale is None:
+                columns[ target ] = df[ source ]
+            else:
+                columns[ target ] = df[ source ] * scale
+        return pd.DataFrame( columns , copy = False )
+    
+    
+    
+    def compactColumnMap( columnMap ):
+        '''
+        HELPER METHOD
+        
+        compactColumnMap()
+        
+        Rows of a column map that compact raw data keeps, see compactColumns
+        
+        @param columnMap   -List of tuples, column map of a raw data format
+        
+        @return            -List of tuples, rows of the compact columns
+        '''
+        return [ column for column in columnMap if column[1] in rawDataImport.compactColumns ]
+    
+    
+    
+    def rawFilesPathList( path ):
+        '''
+        HELPER METHOD
+        
+        rawFilesPathList()
+        
+        Create a list of the paths of all the raw data files, CSV files first 
+        then EPW files.  Same order as rawFilesNamesList()
+        
+        @param path       -String, current working directory
+        
+        @return allFiles  -List of Strings, paths of the raw data files
+        '''
+        allFilesCSV = glob.glob(path + '\Python_RawData_Combined' + "/*.csv")
+        allFilesEPW = glob.glob(path + '\Python_RawData_Combined' + "/*.epw")
+        return allFilesCSV + allFilesEPW
+    
+    
+    
+    def rawArchiveSourcesList( path ):
+        '''
+        HELPER METHOD
+        
+        rawArchiveSourcesList()
+        
+        Create a list of the raw data files of \RawData without extracting 
+        them.  The .csv and .epw members of the .zip archives are listed as 
+        "archive path|member name" and the loose files by their path.  CSV 
+        files come first then EPW files ( sorted by file name ), a file name 
+        found more than once is listed from the same source the extraction 
+        keeps, see rawDataExtract.resolveRawSources().
+        
+        @param path       -String, current working directory
+        
+        @return sources   -List of Strings, raw data sources, see openRawFile()
+        '''
+        zipFiles , rawFiles = rawDataExtract.findRawSources( path + '\\RawData' )
+        winners , duplicates = rawDataExtract.resolveRawSources( zipFiles , rawFiles )
+        sources = []
+        for zipPath , member in winners.values():
+            if zipPath is None:
+                sources.append( member )
+            else:
+                sources.append( zipPath + rawDataImport.zipMemberSeparator + member )
+        # Same order as rawFilesPathList(), CSV files then EPW files
+        return sorted( sources , key = lambda x: ( rawDataImport.sourceName( x ).lower().endswith( '.epw' ) ,
+                                                   rawDataImport.sourceName( x ) ) )
+    
     
     
-    def rawDataToTuple( path ):
+    def rawSourcesList( path , fromArchives = False ):
+        '''
+        HELPER METHOD
+        
+        rawSourcesList()
+        
+        Create a list of the raw data files to parse
+        
+        @param path          -String, current working directory
+        @param fromArchives  -Boolean, True reads the files directly out of the 
+                                    archives of \RawData ( see 
+                                    rawArchiveSourcesList() ), False reads
+                                    the extracted files of 
+                                    \Python_RawData_Combined
+        
+        @return              -List of Strings, raw data sources
+        '''
+        if fromArchives:
+            return rawDataImport.rawArchiveSourcesList( path )
+        return rawDataImport.rawFilesPathList( path )
+    
+    
+    
+    def sourceName( filePath ):
+        '''
+        HELPER METHOD
+        
+        sourceName()
+        
+        File name of a raw data source without its directory ( or archive )
+        
+        @param filePath   -String, path of the raw data file or 
+                                "archive path|member name"
+        
+        @return           -String, file name with extension
+        '''
+        return os.path.basename( filePath.split( rawDataImport.zipMemberSeparator )[-1] )
+    
+    
+    
+    def openRawFile( filePath ):
+        '''
+        HELPER METHOD
+        
+        openRawFile()
+        
+        Open a raw data source as text.  A member of a .zip archive is 
+        decompressed as it is read, nothing is written to disk.
+        
+        @param filePath   -String, path of the raw data file or 
+                                "archive path|member name"
+        
+        @return           -file like object, text of the raw data file
+        '''
+        if rawDataImport.zipMemberSeparator not in filePath:
+            return open( filePath , 'r' , encoding = 'utf-8' , errors = 'ignore' )
+        zipPath , memberName = filePath.split( rawDataImport.zipMemberSeparator , 1 )
+        # The member keeps the archive file open until the member is closed
+        with zipfile.ZipFile( zipPath , 'r' ) as zip_ref:
+            member = zip_ref.open( memberName , 'r' )
+        return io.TextIOWrapper( member , encoding = 'utf-8' , errors = 'ignore' )
+    
+    
+    
+    def pickleName( filePath ):
+        '''
+        HELPER METHOD
+        
+        pickleName()
+        
+        Name of the raw pickle of a raw data file, the file name without the 
+        extension plus .pickle ( same names as pickleNameList() )
+        
+        @param filePath   -String, path of the raw data file, see sourceName()
+        
+        @return           -String, file name with pickle extension
+        '''
+        return rawDataImport.sourceName( filePath )[:-4] + '.pickle'
+    
+    
+    
+    def csvLocationLine( firstLine ):
+        '''
+        HELPER METHOD
+        
+        csvLocationLine()
+        
+        Create the site location data of a TMY3 CSV file from its first line,
+        the coordinates, time zone and elevation are converted to floats.
+        
+        @param firstLine  -String, first line of the CSV file
+        
+        @return           -Series, site location data ( see firstRowColumns )
+        '''
+        fields = next( csv.reader( [ firstLine ] ) , [] )
+        # Missing fields at the end of the line are left empty
+        fields = fields + [''] * ( len( rawDataImport.firstRowColumns ) - len( fields ) )
+        location = dict( zip( rawDataImport.firstRowColumns , fields ) )
+        for column in rawDataImport.firstRowFloatColumns:
+            try:
+                location[ column ] = float( location[ column ] )
+            except ValueError:
+                location[ column ] = float( 'nan' )
+        return pd.Series( location , dtype = object , name = 0 )
+    
+    
+    
+    def csvLocation( filePath ):
+        '''
+        HELPER METHOD
+        
+        csvLocation()
+        
+        Read the site location data of a TMY3 CSV file.  Only the first line 
+        of the file is read, see csvLocationLine()
+        
+        @param filePath   -String, path of the CSV file, see openRawFile()
+        
+        @return           -Series, site location data ( see firstRowColumns )
+        '''
+        with rawDataImport.openRawFile( filePath ) as f:
+            return rawDataImport.csvLocationLine( f.readline() )
+    
+    
+    
+    def csvToTuple( filePath , compact = False ):
+        '''
+        HELPER METHOD
+        
+        csvToTuple()
+        
+        Read a TMY3 CSV file into a tuple of site location data and hourly data
+        
+        @param filePath   -String, path of the CSV file, see openRawFile()
+        @param compact    -Boolean, True only reads the compactColumns of 
+                                tmy3ColumnMap with their dtypes
+        
+        @return           -tuple, ( series:location data , dataframe: metadata)
+        '''
+        with rawDataImport.openRawFile( filePath ) as f:
+            # Create location for this CSV from its first line
+            location_series = rawDataImport.csvLocationLine( f.readline() )
+            if compact:
+                columnMap = rawDataImport.compactColumnMap( rawDataImport.tmy3ColumnMap )
+                csv_df = pd.read_csv(f, skiprows= 1 , header=None, 
+                                     usecols = [ column[0] for column in columnMap ] ,
+                                     dtype = { column[0] : column[3] for column in columnMap
+                                               if column[3] is not None } )
+            else:
+                columnMap = rawDataImport.tmy3ColumnMap
+                csv_df = pd.read_csv(f, header=0)
+                # Some CSV files contain uneeded headers, the columns are mapped 
+                #    by position
+                csv_df.columns = range( len( csv_df.columns ) )
+        csv_df = rawDataImport.applyColumnMap( csv_df , columnMap )
+        return ( location_series , csv_df )
+    
+    
+    
+    def epwToTuple( filePath , compact = False ):
+        '''
+        HELPER METHOD
+        
+        epwToTuple()
+        
+        Read an EPW file into a tuple of site location data and hourly data
+        
+        @param filePath   -String, path of the EPW file, see openRawFile()
+        @param compact    -Boolean, True only reads the compactColumns of 
+                                epwColumnMap with their dtypes
+        
+        @return           -tuple, ( series:location data , dataframe: metadata)
+        '''
+        # Use helper method to convert the EPW file to a dataframe, the site
+        #    metadata comes from the same parse
+        if compact:
+            columnMap = rawDataImport.compactColumnMap( rawDataImport.epwColumnMap )
+            dtype = dict( rawDataImport.epwDateColumns )
+            dtype.update( { column[0] : column[3] for column in columnMap
+                            if column[3] is not None } )
+            epw_df , epwFirstRow = rawDataImport.read_epw(filePath , coerce_year=None ,
+                                            usecols = list( dtype ) ,
+                                            dtype = dtype )
+        else:
+            columnMap = rawDataImport.epwColumnMap
+            epw_df , epwFirstRow = rawDataImport.read_epw(filePath , coerce_year=None)
+        #Put the datetime objects into their own column ( local time without 
+        #    the time zone ).  firstClean.cleanedFrame() uses the datetimes 
+        #    directly instead of the Date and Time strings of TMY3 data
+        epw_df['Local Date Time'] = epw_df.index.tz_localize(None)
+        epw_df.reset_index(drop=True, inplace=True)
+        #Rename the columns and convert the units ( see epwColumnMap )
+        epw_df = rawDataImport.applyColumnMap( epw_df , columnMap )
+        
+        #Get site location data for the EPW files
+        location_series = rawDataImport.epwLocation( filePath , epwFirstRow )
+        return ( location_series , epw_df )
+    
+    
+    
+    def epwLocation( filePath , epwFirstRow ):
+        '''
+        HELPER METHOD
+        
+        epwLocation()
+        
+        Create the site location data of an EPW file from its metadata 
+        dictionary ( see read_epw_header() )
+        
+        @param filePath      -String, path of the EPW file
+        @param epwFirstRow   -dictionary, site metadata of the EPW file
+        
+        @return              -Series, site location data ( see firstRowColumns )
+        '''
+        #Find and store the UniqueID for this site
+        return pd.Series({'Site Identifier Code': cleanRawOutput.string_UniqueID( rawDataImport.sourceName( filePath ) ),
+                          'Station name':epwFirstRow.get('city'),
+                          'Station State': '',   
+                          'Site time zone (Universal time + or -)': epwFirstRow.get('TZ'),
+                          'Site latitude': epwFirstRow.get('latitude'), 
+                          'Site longitude': epwFirstRow.get('longitude'),
+                          'Site elevation (meters)': epwFirstRow.get('altitude'),
+                          'Station country or political unit': epwFirstRow.get('country'),
+                          'WMO region': '',
+                          'Time zone code': '',
+                          'Koppen-Geiger climate classification': ''
+                         }, dtype = object , name = 0 )
+    
+    
+    
+    def rawFileToTuple( filePath , compact = False ):
+        '''
+        HELPER METHOD
+        
+        rawFileToTuple()
+        
+        Read one raw data file ( CSV or EPW ) into a tuple of site location 
+        data and hourly data
+        
+        @param filePath   -String, path of the raw data file
+        @param compact    -Boolean, True only reads the columns used by the
+                                level 1 processing with typed dtypes
+        
+        @return           -tuple, ( series:location data , dataframe: metadata)
+        '''
+        if filePath.lower().endswith('.epw'):
+            return rawDataImport.epwToTuple( filePath , compact )
+        return rawDataImport.csvToTuple( filePath , compact )
+    
+    
+    
+    def rawFileToPickle( path , filePath , compact = False ):
+        '''
+        HELPER METHOD
+        
+        rawFileToPickle()
+        
+        Read one raw data file and store its tuple as a pickle.  Does not 
+        return the data so it can be run inside of a worker process.
+        
+        @param path            -String, current working directory
+        @param filePath        -String, path of the raw data file
+        @param compact         -Boolean, see rawFileToTuple()
+        
+        @return pickleName     -String, file name of the pickle written
+        @return record         -dictionary, first row summary record of the 
+                                    site, see firstRowRecord()
+        '''
+        pickleName = rawDataImport.pickleName( filePath )
+        locationAllData_tuple = rawDataImport.rawFileToTuple( filePath , compact )
+        with open( path + \
+            '\\Pandas_Pickle_DataFrames\\Pickle_RawData' +'\\'+ 
+            pickleName, 'wb') as f:
+            pickle.dump(locationAllData_tuple, f)
+        return pickleName , rawDataImport.firstRowRecord( filePath , locationAllData_tuple[0] )
+    
+    
+    
+    def rawDataToTuple( path , processes = 1 , compact = False , fromArchives = False ):
         '''
         EXECUTION METHOD
         
-        filesToDataFrame()
+        rawDataToTuple()
         
         Create tuples from all the raw data (CSV and EPW files).  
         Tuple will contain site location data and hourly weather metadata saved 
         as a pickle file.
         ( series:location data , dataframe: metadata)
         
-        @param path            -String, current working directory
+        Each site is written as soon as it is read so memory stays bounded by
+        one site (per worker).  Every file is independent so the files can be 
+        parsed by a pool of worker processes.
         
-        @return void create pickle files containing tuple of raw TMY3 data               
+        @param path            -String, current working directory
+        @param processes       -int, number of worker processes.
+                                    1 = serial, None = every core
+        @param compact         -Boolean, True only stores the columns used by
+                                    the level 1 processing ( float32 ), 
+                                    see tmy3ColumnMap and epwColumnMap
+        @param fromArchives    -Boolean, True streams the files straight out 
+                                    of the archives of \RawData without
+                                    extracting them, see rawSourcesList()
+        
+        @return records        -List of dictionaries, first row summary record
+                                    of every file ( same order as the files ),
+                                    pass to createPickleFileFirstRow() so 
+                                    the files are not opened again.
+                                    Creates pickle files containing tuple 
+                                    of raw TMY3 data
         '''        
-        allCsvFiles = glob.glob(path + '\Python_RawData_Combined' + "/*.csv")
-        allEpwFiles = glob.glob(path + '\Python_RawData_Combined' + "/*.epw")
-        tupleList = []
-
-        # For loop to make all CSV files into tuples   
-        for i in range( 0 , len( allCsvFiles ) ):  
-            csv_df = pd.read_csv(allCsvFiles[i], skiprows= 1 ,  header=0)
-            # Filter to aggregate data together, Some CSV files contain uneeded headers
-            if len(csv_df.columns) == 71:
-                csv_df = csv_df.drop(['PresWth source','PresWth uncert (code)'], axis=1)
-                
-            csv_df = rawDataImport.RenameFrame(csv_df)
-            # Create location for this CSV 
-            location_df = pd.read_csv(allCsvFiles[i], skiprows= 0 , nrows= 1, header = None,
-                     names =['Site Identifier Code',
-                            'Station name',
-                            'Station State', 
-                            'Site time zone (Universal time + or -)',
-                            'Site latitude', 
-                            'Site longitude',
-                            'Site elevation (meters)',
-                            'Station country or political unit',
-                            'WMO region',
-                            'Time zone code',
-                            'Koppen-Geiger climate classification'] )
-            location_series = location_df.iloc[0]
-            # Add all the CSV tuples to the list
-            locationAllData_tuple = ( location_series , csv_df )
-            tupleList.append( locationAllData_tuple )
-            
-
-        # For loop to make all EPW files into tuples
-        for j in range( 0 , len( allEpwFiles ) ):  
-            # Use helper method to convert the EPW file to a dataframe
-            epw_df = rawDataImport.read_epw_df(allEpwFiles[j] , coerce_year=None)
-            #Put the datetime objects into their own column by reseting the index
-            epw_df.reset_index(inplace=True)
-            #Convert the pandas time series to MM/DD/YYYY format
-            epw_df['Date (MM/DD/YYYY)'] = epw_df['index'].map(lambda x: x.strftime('%m/%d/%Y'))
-            #Convert the pandas time series to "Hour(24hrs scale):Minute"
-            epw_df['Time (HH:MM)'] = epw_df['index'].map(lambda x: x.strftime('%H:%M'))
-            #Convert the atmospheric pressure form Pa to mbar
-            epw_df['atmospheric_pressure'] = epw_df['atmospheric_pressure'].apply(lambda x: x/100)
-            #Convert the visibility from km to m
-            epw_df['visibility'] = epw_df['visibility'].apply(lambda x: x*1000)        
-            # Drop columns that we do not need
-            epw_df = epw_df.drop(['index', 
-                                  'year',
-                                  'month',
-                                  'day',
-                                  'hour',
-                                  'minute',
-                                  'data_source_unct'], 
-                                    axis=1)
-            #Re-index the columns in a proper fashion
-            epw_df = epw_df.reindex(columns = ['Date (MM/DD/YYYY)', 
-                                               'Time (HH:MM)',
-                                               'etr',
-                                               'etrn',
-                                               'ghi_infrared',
-                                               'ghi',
-                                               'dni', 
-                                               'dhi',
-                                               'global_hor_illum',
-                                               'direct_normal_illum', 
-                                               'diffuse_horizontal_illum',
-                                               'zenith_luminance',
-                                               'total_sky_cover',
-                                               'opaque_sky_cover',
-                                               'temp_air',
-                                               'temp_dew',
-                                               'relative_humidity',
-                                               'atmospheric_pressure',
-                                               'wind_direction',
-                                               'wind_speed',
-                                               'visibility', 
-                                               'ceiling_height',
-                                               'precipitable_water',
-                                               'aerosol_optical_depth',
-                                               'albedo',
-                                               'liquid_precipitation_depth',
-                                               'liquid_precipitation_quantity',
-                                               'present_weather_observation',
-                                               'present_weather_codes',
-                                               'snow_depth',
-                                               'days_since_last_snowfall'])                                          
-            epw_df.columns = ['Date (MM/DD/YYYY)', 
-                          'Time (HH:MM)',
-                          'Hourly extraterrestrial radiation on a horizontal surface',
-                          'Hourly extraterrestrial radiation normal to the sun',
-                          'Horizontal infrared radiation',
-                          'Global horizontal irradiance',
-                          'Direct normal irradiance',
-                          'Diffuse horizontal irradiance',
-                          'Global horizontal illuminance',
-                          'Direct normal illuminance',
-                          'Diffuse horizontal illuminance',
-                          'Zenith luminance',
-                          'Total sky cover',
-                          'Opaque sky cover',
-                          'Dry-bulb temperature',
-                          'Dew-point temperature',
-                          'Relative humidity',
-                          'Station pressure',
-                          'Wind direction',
-                          'Wind speed',
-                          'Horizontal visibility',
-                          'Ceiling height',
-                          'Precipitable water',
-                          'Aerosol optical depth, broadband',
-                          'Albedo',
-                          'Liquid percipitation depth',
-                          'Liquid percipitation quantity',
-                          'Present Weather Observations',
-                          'Present Weather Codes',
-                          'Snow Depth',
-                          'Days Since Last Snowfall']   
-            
-            #Get site location data for the EPW files     
-            epwFirstRow = rawDataImport.read_epw_firstRow(allEpwFiles[j], coerce_year=None)
-            location_df = pd.DataFrame(columns=['Site Identifier Code',
-                                            'Station name',
-                                            'Station State', 
-                                            'Site time zone (Universal time + or -)',
-                                            'Site latitude', 
-                                            'Site longitude',
-                                            'Site elevation (meters)',
-                                            'Station country or political unit',
-                                            'WMO region',
-                                            'Time zone code',
-                                            'Koppen-Geiger climate classification'])
-            location_df = location_df.append({'Site Identifier Code': '',
-                                      'Station name':epwFirstRow.get('city'),
-                                      'Station State': '',   
-                                      'Site time zone (Universal time + or -)': epwFirstRow.get('TZ'),
-                                      'Site latitude': epwFirstRow.get('latitude'), 
-                                      'Site longitude': epwFirstRow.get('longitude'),
-                                      'Site elevation (meters)': epwFirstRow.get('altitude'),
-                                      'Station country or political unit': epwFirstRow.get('country'),
-                                      'WMO region': '',
-                                      'Time zone code': '',
-                                      'Koppen-Geiger climate classification': ''
-                                    }, ignore_index=True ) 
-            
-            #Find and store the UniqueID for this site
-            uniqueID = cleanRawOutput.string_UniqueID( allEpwFiles[j] )
-            location_df['Site Identifier Code'] = uniqueID
-            # Add all the EPW tuples to the list
-            location_series = location_df.iloc[0]         
-            locationAllData_tuple = ( location_series , epw_df )
-            tupleList.append( locationAllData_tuple )
-        
-        #Name and store all the tuples as pickles in a directory
-        fileNames = rawDataImport.rawFilesNamesList( path )
-        pickleStringList = rawDataImport.pickleNameList( fileNames )
-        
-        for k in range(0 , len(pickleStringList)):
-            with open( path + \
-                '\\Pandas_Pickle_DataFrames\\Pickle_RawData' +'\\'+ 
-                pickleStringList[k], 'wb') as f:
-                pickle.dump(tupleList[k], f)
-
-    
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+        filePaths = rawDataImport.rawSourcesList( path , fromArchives )
+        records = []
+        if processes == 1:
+            for filePath in filePaths:
+                pickleName , record = rawDataImport.rawFileToPickle( path , filePath , compact )
+                records.append( record )
+        else:
+            if processes is None:
+                processes = os.cpu_count()
+            # Send a few files at a time to each worker to limit the overhead
+            #    of passing the arguments between processes
+            chunkSize = max( 1 , len( filePaths ) // ( processes * 16 ) )
+            with ProcessPoolExecutor( max_workers = processes ) as executor:
+                # map() returns in the order of the files, consume it so 
+                #    any error of a worker is raised here
+                for pickleName , record in executor.map( rawDataImport.rawFileToPickle ,
+                                                         [ path ] * len( filePaths ) ,
+                                                         filePaths ,
+                                                         [ compact ] * len( filePaths ) ,
+                                                         chunksize = chunkSize ):
+                    records.append( record )
+        return records
 
     
 
@@ -434,96 +706,104 @@ class rawDataImport:
     
 
 
-    def cleanFirstRowDataFrame( path ):
+    def rawFileLocation( filePath ):
+        '''
+        HELPER METHOD
+        
+        rawFileLocation()
+        
+        Read the site location data of one raw data file ( CSV or EPW ) 
+        without reading the hourly data
+        
+        @param filePath   -String, path of the raw data file
+        
+        @return           -Series, site location data ( see firstRowColumns )
+        '''
+        if filePath.lower().endswith('.epw'):
+            return rawDataImport.epwLocation( filePath , rawDataImport.read_epw_header( filePath ) )
+        return rawDataImport.csvLocation( filePath )
+    
+    
+    
+    def firstRowRecord( filePath , location_series ):
+        '''
+        HELPER METHOD
+        
+        firstRowRecord()
+        
+        Create the first row summary record of a site from its location data.
+        The Site Identifier Code and Data Source are parsed from the file name
+        here ( at ingest ) so they are never parsed again, see 
+        cleanRawOutput.parseFileName().  The station name of the file name is
+        used when the location data has none.
+        
+        @param filePath          -String, path of the raw data file
+        @param location_series   -Series, site location data of the file
+        
+        @return                  -dictionary, first row summary record
+        '''
+        fileNameRecord = cleanRawOutput.parseFileName( rawDataImport.sourceName( filePath ) )
+        record = { column : location_series.get( column ) for column in rawDataImport.firstRowColumns }
+        record['Site Identifier Code'] = fileNameRecord.siteID
+        record['Data Source'] = fileNameRecord.dataSource
+        # Raw pickle of the site, kept for the site index only
+        record['FilePath'] = rawDataImport.pickleName( filePath )
+        if record['Station name'] is None or str( record['Station name'] ).strip() in ( '' , '-' ):
+            record['Station name'] = fileNameRecord.stationName
+        return record
+    
+    
+    
+    def firstRowRecords( path , fromArchives = False ):
+        '''
+        HELPER METHOD
+        
+        firstRowRecords()
+        
+        Create the first row summary record of every raw data file by only 
+        reading the first line of the files
+        
+        @param path           -String, current working directory
+        @param fromArchives   -Boolean, see rawSourcesList()
+        
+        @return               -List of dictionaries, first row summary records
+        '''
+        return [ rawDataImport.firstRowRecord( filePath , rawDataImport.rawFileLocation( filePath ) )
+                 for filePath in rawDataImport.rawSourcesList( path , fromArchives ) ]
+    
+    
+    
+    def cleanFirstRowDataFrame( path , records = None , fromArchives = False ):
         '''
         HELPER METHOD
         
         cleanFirstRowDataFrame()
         
-        Create the First row summary from both csv and epw
+        Create the First row summary from both csv and epw.  The frame is 
+        built once from the records of every file, the coordinates, time zone
+        and elevation columns are floats.  The Data Source column is added to
+        the location data columns, see firstRowRecord()
         
          @param path                -String, path of current working directory
+         @param records             -List of dictionaries, first row summary 
+                                        records returned by rawDataToTuple(),
+                                        None only reads the first line of 
+                                        every raw data file
+         @param fromArchives        -Boolean, see rawSourcesList()
         
          @return firstRowDataFrame  -DataFrame, clean and frame of all the first rows of .csv files                  
         '''
-        # Create the data frame from the first line of the .csv files
-    
-        path = path + '\Python_RawData_Combined'  
-        
+        if records is None:
+            records = rawDataImport.firstRowRecords( path , fromArchives )
         #Create a pandas frame of all the row 1 data 
-        row1_df = pd.DataFrame(columns=['Site Identifier Code',
-                                        'Station name',
-                                        'Station State', 
-                                        'Site time zone (Universal time + or -)',
-                                        'Site latitude', 
-                                        'Site longitude',
-                                        'Site elevation (meters)',
-                                        'Station country or political unit',
-                                        'WMO region',
-                                        'Time zone code',
-                                        'Koppen-Geiger climate classification'])
-                
-        #Glob all the .csv files together        
-        allFilesCSV = glob.glob(path + "/*.csv")
-        #Organize all Csv files into a pandas frame
-        for i in range(0, len(allFilesCSV)):
-        
-            csv_df = pd.read_csv(allFilesCSV[i], skiprows= 0 ,nrows= 1, header = None, 
-                                 names =['Site Identifier Code',
-                                        'Station name',
-                                        'Station State', 
-                                        'Site time zone (Universal time + or -)',
-                                        'Site latitude', 
-                                        'Site longitude',
-                                        'Site elevation (meters)',
-                                        'Station country or political unit',
-                                        'WMO region',
-                                        'Time zone code',
-                                        'Koppen-Geiger climate classification'] )
-            
-            row1_df = row1_df.append({'Site Identifier Code': csv_df['Site Identifier Code'][0],
-                                      'Station name': csv_df['Station name'][0],
-                                      'Station State': csv_df['Station State'][0],   
-                                      'Site time zone (Universal time + or -)': csv_df[ 'Site time zone (Universal time + or -)'][0],
-                                      'Site latitude': csv_df['Site latitude'][0], 
-                                      'Site longitude': csv_df['Site longitude'][0],
-                                      'Site elevation (meters)': csv_df['Site elevation (meters)'][0],
-                                      'Station country or political unit': csv_df['Station country or political unit'][0],
-                                      'WMO region': csv_df['WMO region'][0],
-                                      'Time zone code': csv_df['Time zone code'][0],
-                                      'Koppen-Geiger climate classification': csv_df['Koppen-Geiger climate classification'][0]
-                                    }, ignore_index=True )
-        #glob all the .epw files together
-        allFilesEPW = glob.glob(path + "/*.epw") 
-        
-        for j in range( 0 , len(allFilesEPW)):
-            #Helper method that pulls the first row of data
-            epwFirstRow = rawDataImport.read_epw_firstRow(allFilesEPW[j], coerce_year=None)
-        
-            # Use the dictionary created to append the master frame
-            row1_df = row1_df.append({'Site Identifier Code': '',
-                                      'Station name':epwFirstRow.get('city'),
-                                      'Station State': '',   
-                                      'Site time zone (Universal time + or -)': epwFirstRow.get('TZ'),
-                                      'Site latitude': epwFirstRow.get('latitude'), 
-                                      'Site longitude': epwFirstRow.get('longitude'),
-                                      'Site elevation (meters)': epwFirstRow.get('altitude'),
-                                      'Station country or political unit': epwFirstRow.get('country'),
-                                      'WMO region': '',
-                                      'Time zone code': '',
-                                      'Koppen-Geiger climate classification': ''
-                                    }, ignore_index=True ) 
-    
-    
-        uniqueID = allFilesCSV + allFilesEPW
-        uniqueID = cleanRawOutput.stringList_UniqueID_List( uniqueID )
-        row1_df['Site Identifier Code'] = uniqueID
-        
+        row1_df = pd.DataFrame.from_records( records , columns = rawDataImport.firstRowColumns + ['Data Source'] )
+        for column in rawDataImport.firstRowFloatColumns:
+            row1_df[ column ] = pd.to_numeric( row1_df[ column ] , errors = 'coerce' ).astype( 'float64' )
         return row1_df
         
         
     
-    def createPickleFileFirstRow( path ):
+    def createPickleFileFirstRow( path , records = None , fromArchives = False ):
         '''
         Main METHOD
         
@@ -533,18 +813,27 @@ class rawDataImport:
         Combine the lists into a dataframe and save it as a pickle
         
          @param path          -string, current working directory
+         @param records       -List of dictionaries, first row summary records
+                                    returned by rawDataToTuple(), None reads 
+                                    the first line of every raw data file
+         @param fromArchives  -Boolean, see rawSourcesList()
         
          @return void         -Will convert dataframe into raw pickle datafile 
-                          
+                                    and create the site index, see 
+                                    siteIndex.createSiteIndex()
         '''  
         fileName = 'firstRowSummary_Of_CSV_Files'
+        if records is None:
+            records = rawDataImport.firstRowRecords( path , fromArchives )
         # Convert the fileNames to have a .pickle extention
-        dataFrame = rawDataImport.cleanFirstRowDataFrame( path )
+        dataFrame = rawDataImport.cleanFirstRowDataFrame( path , records )
         dataFrame.to_pickle( path + '\Pandas_Pickle_DataFrames\Pickle_FirstRows' +'\\'+ fileName + '.pickle' )
+        # Index the sites by their Site Identifier Code ( same rows as the summary )
+        siteIndex.createSiteIndex( path , records )
     
     
     
-    def read_epw_df(filename, coerce_year=None):
+    def read_epw(filename, coerce_year=None, usecols=None, dtype=None):
         '''
         Read an EPW file in to a pandas dataframe.
         
@@ -569,6 +858,13 @@ class rawDataImport:
             Warning: EPW files always have 365*24 = 8760 data rows;
             be careful with the use of leap years.
         
+        usecols : None or list, default None
+            Names of the columns to read (see colnames), None reads every
+            column. year, month, day and hour are needed for the index.
+        
+        dtype : None or dict, default None
+            dtype of the columns read, {column name : dtype}
+        
         
         Returns
         -------
@@ -651,30 +947,10 @@ class rawDataImport:
         [1] EnergyPlus documentation, Auxiliary Programs
         https://energyplus.net/documentation.
         '''    
-        if filename.startswith('http'):
-            # Attempts to download online EPW file
-            # See comments above for possible online sources
-            request = Request(filename, headers={'User-Agent': (
-                'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_13_5) '
-                'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/67.0.3396.87 '
-                'Safari/537.36')})
-            response = urlopen(request)
-            csvdata = io.StringIO(response.read().decode(errors='ignore'))
-        else:
-            # Assume it's accessible via the file system
-            csvdata = open(filename, 'r')
+        csvdata = rawDataImport.open_epw( filename )
     
         # Read line with metadata
-        firstline = csvdata.readline()
-    
-        head = ['loc', 'city', 'state-prov', 'country', 'data_type', 'WMO_code',
-                'latitude', 'longitude', 'TZ', 'altitude']
-        meta = dict(zip(head, firstline.rstrip('\n').split(",")))
-    
-        meta['altitude'] = float(meta['altitude'])
-        meta['latitude'] = float(meta['latitude'])
-        meta['longitude'] = float(meta['longitude'])
-        meta['TZ'] = float(meta['TZ'])
+        meta = rawDataImport.epw_firstLineMeta( csvdata.readline() )
     
         colnames = ['year', 'month', 'day', 'hour', 'minute', 'data_source_unct',
                     'temp_air', 'temp_dew', 'relative_humidity',
@@ -690,147 +966,104 @@ class rawDataImport:
     
         # We only have to skip 6 rows instead of 7 because we have already used
         # the realine call above.
-        data = pd.read_csv(csvdata, skiprows=6, header=0, names=colnames)
+        data = pd.read_csv(csvdata, skiprows=6, header=0, names=colnames,
+                           usecols=usecols, dtype=dtype)
     
         # Change to single year if requested
         if coerce_year is not None:
             data["year"] = coerce_year
     
         # create index that supplies correct date and time zone information
-        dts = data[['month', 'day']].astype(str).apply(lambda x: x.str.zfill(2))
-        hrs = (data['hour'] - 1).astype(str).str.zfill(2)
-        dtscat = data['year'].astype(str) + dts['month'] + dts['day'] + hrs
-        idx = pd.to_datetime(dtscat, format='%Y%m%d%H')
+        idx = rawDataImport.epw_localDateTime(data['year'], data['month'],
+                                              data['day'], data['hour'])
         idx = idx.dt.tz_localize(int(meta['TZ'] * 3600))
         data.index = idx
+        csvdata.close()
     
-        return data 
+        return data, meta
     
 
     
-    def read_epw_firstRow(filename, coerce_year=None):
+    def read_epw_df(filename, coerce_year=None):
         '''
-        Read an EPW file in to a pandas dataframe.
+        Read an EPW file in to a pandas dataframe, see read_epw()
         
-        Note that values contained in the metadata dictionary are unchanged
-        from the EPW file.
-        
-        EPW files are commonly used by building simulation professionals
-        and are widely available on the web. For example via:
-        https://energyplus.net/weather , http://climate.onebuilding.org or
-        http://www.ladybug.tools/epwmap/
+        @param filename      -String, file path or url of the EPW file
+        @param coerce_year   -None or int, year to set the data to
         
+        @return data         -DataFrame, hourly data of the EPW file
+        '''
+        data, meta = rawDataImport.read_epw(filename, coerce_year=coerce_year)
+        return data
+    
+    
+    
+    def open_epw(filename):
+        '''
+        HELPER METHOD
         
-        Parameters
-        ----------
-        filename : String
-            Can be a relative file path, absolute file path, or url.
-        
-        coerce_year : None or int, default None
-            If supplied, the year of the data will be set to this value. This can
-            be a useful feature because EPW data is composed of data from
-            different years.
-            Warning: EPW files always have 365*24 = 8760 data rows;
-            be careful with the use of leap years.
-        
-        
-        Returns
-        -------
-        Tuple of the form (data, metadata).
-        
-        data : DataFrame
-            A pandas dataframe with the columns described in the table
-            below. For more detailed descriptions of each component, please
-            consult the EnergyPlus Auxiliary Programs documentation
-            available at: https://energyplus.net/documentation.
-        
-        metadata : dict
-            The site metadata available in the file.
-        
-        Notes
-        -----
-        
-        The returned structures have the following fields.
-        
-        ===============   ======  =========================================
-        key               format  description
-        ===============   ======  =========================================
-        loc               String  default identifier, not used
-        city              String  site loccation
-        state-prov        String  state, province or region (if available)
-        country           String  site country code
-        data_type         String  type of original data source
-        WMO_code          String  WMO identifier
-        latitude          Float   site latitude
-        longitude         Float   site longitude
-        TZ                Float   UTC offset
-        altitude          Float   site elevation
-        ===============   ======  =========================================
-        
+        open_epw()
         
-        =============================       ==============================================================================================================================================================
-        EPWData field                       description
-        =============================       ==============================================================================================================================================================
-        index                               A pandas datetime index. NOTE, times are set to local standard time (daylight savings is not included). Days run from 0-23h to comply with PVLIB's convention
-        year                                Year, from original EPW file. Can be overwritten using coerce function.
-        month                               Month, from original EPW file
-        day                                 Day of the month, from original EPW file.
-        hour                                Hour of the day from original EPW file. Note that EPW's convention of 1-24h is not taken over in the index dataframe used in PVLIB.
-        minute                              Minute, from original EPW file. Not used.
-        data_source_unct                    Data source and uncertainty flags. See [1], chapter 2.13
-        temp_air                            Dry bulb temperature at the time indicated, deg C
-        temp_dew                            Dew-point temperature at the time indicated, deg C
-        relative_humidity                   Relatitudeive humidity at the time indicated, percent
-        atmospheric_pressure                Station pressure at the time indicated, Pa
-        etr                                 Extraterrestrial horizontal radiation recv'd during 60 minutes prior to timestamp, Wh/m^2
-        etrn                                Extraterrestrial normal radiation recv'd during 60 minutes prior to timestamp, Wh/m^2
-        ghi_infrared                        Horizontal infrared radiation recv'd during 60 minutes prior to timestamp, Wh/m^2
-        ghi                                 Direct and diffuse horizontal radiation recv'd during 60 minutes prior to timestamp, Wh/m^2
-        dni                                 Amount of direct normal radiation (modeled) recv'd during 60 mintues prior to timestamp, Wh/m^2
-        dhi                                 Amount of diffuse horizontal radiation recv'd during 60 minutes prior to timestamp, Wh/m^2
-        global_hor_illum                    Avg. total horizontal illuminance recv'd during the 60 minutes prior to timestamp, lx
-        direct_normal_illum                 Avg. direct normal illuminance recv'd during the 60 minutes prior to timestamp, lx
-        diffuse_horizontal_illum            Avg. horizontal diffuse illuminance recv'd during the 60 minutes prior to timestamp, lx
-        zenith_luminance                    Avg. luminance at the sky's zenith during the 60 minutes prior to timestamp, cd/m^2
-        wind_direction                      Wind direction at time indicated, degrees from north (360 = north; 0 = undefined,calm)
-        wind_speed                          Wind speed at the time indicated, meter/second
-        total_sky_cover                     Amount of sky dome covered by clouds or obscuring phenonema at time stamp, tenths of sky
-        opaque_sky_cover                    Amount of sky dome covered by clouds or obscuring phenonema that prevent observing the sky at time stamp, tenths of sky
-        visibility                          Horizontal visibility at the time indicated, km
-        ceiling_height                      Height of cloud base above local terrain (7777=unlimited), meter
-        present_weather_observation         Indicator for remaining fields: If 0, then the observed weather codes are taken from the following field. If 9, then missing weather is assumed.
-        present_weather_codes               Present weather code, see [1], chapter 2.9.1.28
-        precipitable_water                  Total precipitable water contained in a column of unit cross section from earth to top of atmosphere, cm
-        aerosol_optical_depth               The broadband aerosol optical depth per unit of air mass due to extinction by aerosol component of atmosphere, unitless
-        snow_depth                          Snow depth in centimeters on the day indicated, (999 = missing data)
-        days_since_last_snowfall            Number of days since last snowfall (maximum value of 88, where 88 = 88 or greater days; 99 = missing data)
-        albedo                              The ratio of reflected solar irradiance to global horizontal irradiance, unitless
-        liquid_precipitation_depth          The amount of liquid precipitation observed at indicated time for the period indicated in the liquid precipitation quantity field, millimeter
-        liquid_precipitation_quantity       The period of accumulation for the liquid precipitation depth field, hour
-        =============================       ==============================================================================================================================================================
+        Open an EPW file from the file system or download it from a url
         
-        References
-        ----------
+        @param filename   -String, Can be a relative file path, absolute file 
+                                path, url or "archive path|member name"
+                                ( see openRawFile() )
         
-        [1] EnergyPlus documentation, Auxiliary Programs
-        https://energyplus.net/documentation.
-        '''    
+        @return           -file like object, text of the EPW file
+        '''
         if filename.startswith('http'):
             # Attempts to download online EPW file
-            # See comments above for possible online sources
+            # See read_epw() for possible online sources
             request = Request(filename, headers={'User-Agent': (
                 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_13_5) '
                 'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/67.0.3396.87 '
                 'Safari/537.36')})
             response = urlopen(request)
-            csvdata = io.StringIO(response.read().decode(errors='ignore'))
+            return io.StringIO(response.read().decode(errors='ignore'))
         else:
-            # Assume it's accessible via the file system
-            csvdata = open(filename, 'r')
+            # Assume it's accessible via the file system ( or a zip archive )
+            return rawDataImport.openRawFile(filename)
     
-        # Read line with metadata
-        firstline = csvdata.readline()
     
+    
+    def epw_localDateTime(year, month, day, hour):
+        '''
+        HELPER METHOD
+        
+        epw_localDateTime()
+        
+        Create the local date times of EPW data from the integer date columns
+        in one call ( no string formatting ).  EPW hours run from 1-24, 
+        the hour is shifted to 0-23 to comply with PVLIB's convention.
+        
+        @param year     -Series, year column of the EPW data
+        @param month    -Series, month column of the EPW data
+        @param day      -Series, day column of the EPW data
+        @param hour     -Series, hour column of the EPW data (1-24)
+        
+        @return         -Series, datetime64 local standard time
+        '''
+        return pd.to_datetime(pd.DataFrame({'year': year.astype('int64'),
+                                            'month': month.astype('int64'),
+                                            'day': day.astype('int64'),
+                                            'hour': hour.astype('int64') - 1}))
+    
+    
+    
+    def epw_firstLineMeta(firstline):
+        '''
+        HELPER METHOD
+        
+        epw_firstLineMeta()
+        
+        Create the metadata dictionary from the LOCATION record (first line)
+        of an EPW file.  See read_epw() for the keys.
+        
+        @param firstline   -String, first line of the EPW file
+        
+        @return meta       -dictionary, site metadata
+        '''
         head = ['loc', 'city', 'state-prov', 'country', 'data_type', 'WMO_code',
                 'latitude', 'longitude', 'TZ', 'altitude']
         meta = dict(zip(head, firstline.rstrip('\n').split(",")))
@@ -839,36 +1072,59 @@ class rawDataImport:
         meta['latitude'] = float(meta['latitude'])
         meta['longitude'] = float(meta['longitude'])
         meta['TZ'] = float(meta['TZ'])
+        return meta
     
-        colnames = ['year', 'month', 'day', 'hour', 'minute', 'data_source_unct',
-                    'temp_air', 'temp_dew', 'relative_humidity',
-                    'atmospheric_pressure', 'etr', 'etrn', 'ghi_infrared', 'ghi',
-                    'dni', 'dhi', 'global_hor_illum', 'direct_normal_illum',
-                    'diffuse_horizontal_illum', 'zenith_luminance',
-                    'wind_direction', 'wind_speed', 'total_sky_cover',
-                    'opaque_sky_cover', 'visibility', 'ceiling_height',
-                    'present_weather_observation', 'present_weather_codes',
-                    'precipitable_water', 'aerosol_optical_depth', 'snow_depth',
-                    'days_since_last_snowfall', 'albedo',
-                    'liquid_precipitation_depth', 'liquid_precipitation_quantity']
     
-        # We only have to skip 6 rows instead of 7 because we have already used
-        # the realine call above.
-        data = pd.read_csv(csvdata, skiprows=6, header=0, names=colnames)
     
-        # Change to single year if requested
-        if coerce_year is not None:
-            data["year"] = coerce_year
+    def read_epw_header(filename, allRecords=False):
+        '''
+        HELPER METHOD
+        
+        read_epw_header()
+        
+        Read the site metadata of an EPW file without reading the hourly data.
+        Only the first line (LOCATION) is read unless all of the header 
+        records are requested.
+        
+        @param filename     -String, file path or url of the EPW file
+        @param allRecords   -Boolean, True also reads the other 7 header 
+                                records as lists of their comma separated 
+                                fields.  Added keys:
+                                design_conditions, typical_extreme_periods,
+                                ground_temperatures, holidays_daylight_savings,
+                                comments_1, comments_2, data_periods
+        
+        @return meta        -dictionary, site metadata, see read_epw()
+        '''
+        csvdata = rawDataImport.open_epw( filename )
+        try:
+            meta = rawDataImport.epw_firstLineMeta( csvdata.readline() )
+            if allRecords:
+                for key in ['design_conditions',
+                            'typical_extreme_periods',
+                            'ground_temperatures',
+                            'holidays_daylight_savings',
+                            'comments_1',
+                            'comments_2',
+                            'data_periods']:
+                    meta[key] = csvdata.readline().rstrip('\n').split(",")
+        finally:
+            csvdata.close()
+        return meta
     
-        # create index that supplies correct date and time zone information
-        dts = data[['month', 'day']].astype(str).apply(lambda x: x.str.zfill(2))
-        hrs = (data['hour'] - 1).astype(str).str.zfill(2)
-        dtscat = data['year'].astype(str) + dts['month'] + dts['day'] + hrs
-        idx = pd.to_datetime(dtscat, format='%Y%m%d%H')
-        idx = idx.dt.tz_localize(int(meta['TZ'] * 3600))
-        data.index = idx
     
-        return meta
+    
+    def read_epw_firstRow(filename, coerce_year=None):
+        '''
+        Read the site metadata dictionary of an EPW file.  Only the first line
+        is read, see read_epw_header()
+        
+        @param filename      -String, file path or url of the EPW file
+        @param coerce_year   -not used, kept for compatibility
+        
+        @return meta         -dictionary, site metadata, see read_epw()
+        '''
+        return rawDataImport.read_epw_header(filename)
 
 
 
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent index of every site keyed by the Site Identifier Code.
+
+The index is written when the raw data is imported and updated by the Level 1
+processing.  Each entry holds
+
+    'rawFile'           file name of the raw data pickle
+    'level1File'        file name of the Level 1 file ( pickle or Parquet ),
+                            None before the Level 1 processing
+    'summaryRow'        row of the site in the first row summary
+    'level1SummaryRow'  row of the site in the Level 1 summary, None before
+                            the Level 1 processing
+    'dataSource'        TMY3, CWEC, IWEC or UNKNOWN
+
+so finding the files of a site is a dictionary lookup instead of a search of
+the pickle directories.
+
+@author: Derek Holsapple
+"""
+
+import os
+import pickle
+import pandas as pd
+
+#For XLwings ref
+from Processing.cleanRawOutput import cleanRawOutput
+from Processing.level1Store import level1Store
+
+
+
+class siteIndex:
+
+
+
+    def indexPath( currentDirectory ):
+        '''
+        HELPER FUNCTION
+
+        indexPath()
+
+        @param currentDirectory  -String, of current working directory
+
+        @return                  -String, path of the site index pickle
+        '''
+        return currentDirectory + '\\Pandas_Pickle_DataFrames\\Pickle_FirstRows\\siteIndex.pickle'
+
+
+
+    def saveSiteIndex( currentDirectory , index ):
+        '''
+        HELPER FUNCTION
+
+        saveSiteIndex()
+
+        @param currentDirectory  -String, of current working directory
+        @param index             -Dictionary, Site Identifier Code : entry
+
+        @return                  -void, stores siteIndex.pickle into
+                                        \Pandas_Pickle_DataFrames\Pickle_FirstRows
+        '''
+        with open( siteIndex.indexPath( currentDirectory ) , 'wb' ) as f:
+            pickle.dump( index , f )
+
+
+
+    def createSiteIndex( currentDirectory , records ):
+        '''
+        EXECUTION FUNCTION
+
+        createSiteIndex()
+
+        Create the site index from the first row summary records of the raw
+        data import.  Must be called with the records in the order of the
+        rows of the first row summary.
+
+        @param currentDirectory  -String, of current working directory
+        @param records           -List of dictionaries, first row summary
+                                        records, see rawDataImport.firstRowRecord()
+
+        @return index            -Dictionary, Site Identifier Code : entry
+        '''
+        index = {}
+        for i in range( 0 , len( records ) ):
+            index[ records[i]['Site Identifier Code'] ] = { 'rawFile' : records[i]['FilePath'] ,
+                                                           'level1File' : None ,
+                                                           'summaryRow' : i ,
+                                                           'level1SummaryRow' : None ,
+                                                           'dataSource' : records[i]['Data Source'] }
+        siteIndex.saveSiteIndex( currentDirectory , index )
+        return index
+
+
+
+    def createSiteIndexFromFiles( currentDirectory ):
+        '''
+        HELPER FUNCTION
+
+        createSiteIndexFromFiles()
+
+        Create the site index of raw data imported before the index existed by
+        matching the raw pickle file names to the first row summary once
+
+        @param currentDirectory  -String, of current working directory
+
+        @return index            -Dictionary, Site Identifier Code : entry
+        '''
+        summary_df = cleanRawOutput.dataSummaryFrame( currentDirectory )
+        summaryRows = { siteID : i for i , siteID in
+                        enumerate( summary_df['Site Identifier Code'].astype( str ) ) }
+        index = {}
+        for fileName in cleanRawOutput.filesNameList( currentDirectory ):
+            fileNameRecord = cleanRawOutput.parseFileName( fileName )
+            # Only sites of the first row summary can be searched
+            if fileNameRecord.siteID not in summaryRows:
+                continue
+            if level1Store.exists( currentDirectory , fileName , 'parquet' ):
+                level1File = os.path.basename( level1Store.level1Path( currentDirectory , fileName , 'parquet' ) )
+            elif level1Store.exists( currentDirectory , fileName , 'pickle' ):
+                level1File = os.path.basename( level1Store.level1Path( currentDirectory , fileName , 'pickle' ) )
+            else:
+                level1File = None
+            index[ fileNameRecord.siteID ] = { 'rawFile' : fileName ,
+                                               'level1File' : level1File ,
+                                               'summaryRow' : summaryRows[ fileNameRecord.siteID ] ,
+                                               'level1SummaryRow' : None ,
+                                               'dataSource' : fileNameRecord.dataSource }
+        siteIndex.saveSiteIndex( currentDirectory , index )
+        return index
+
+
+
+    def loadSiteIndex( currentDirectory ):
+        '''
+        HELPER FUNCTION
+
+        loadSiteIndex()
+
+        Load the site index, the index is created from the pickle files if it
+        does not exist yet
+
+        @param currentDirectory  -String, of current working directory
+
+        @return index            -Dictionary, Site Identifier Code : entry
+        '''
+        if not os.path.isfile( siteIndex.indexPath( currentDirectory ) ):
+            return siteIndex.createSiteIndexFromFiles( currentDirectory )
+        with open( siteIndex.indexPath( currentDirectory ) , 'rb' ) as f:
+            return pickle.load( f )
+
+
+
+    def findSite( currentDirectory , siteID ):
+        '''
+        HELPER FUNCTION
+
+        findSite()
+
+        Find the entry of a site
+
+        @param currentDirectory  -String, of current working directory
+        @param siteID            -String, Site Identifier Code
+
+        @return                  -Dictionary, entry of the site, None if the
+                                        site is not in the index
+        '''
+        return siteIndex.loadSiteIndex( currentDirectory ).get( str( siteID ).strip() )
+
+
+
+    def updateLevel1( currentDirectory , storeFormat = 'pickle' ):
+        '''
+        EXECUTION FUNCTION
+
+        updateLevel1()
+
+        Record the Level 1 file and Level 1 summary row of every site.  Called
+        after the Level 1 summary is stored, see
+        finalOutputFrame.level_1_df_toPickle()
+
+        @param currentDirectory  -String, of current working directory
+        @param storeFormat       -String, 'pickle' or 'parquet' store format
+                                        of the Level 1 files
+
+        @return index            -Dictionary, Site Identifier Code : entry
+        '''
+        index = siteIndex.loadSiteIndex( currentDirectory )
+        summary_df = pd.read_pickle( currentDirectory + '\\Pandas_Pickle_DataFrames\\' + \
+                                     'Pickle_Level1_Summary\\Pickle_Level1_Summary.pickle' )
+        level1SummaryRows = { fileName : j for j , fileName in enumerate( summary_df['FilePath'] ) }
+        for entry in index.values():
+            if level1Store.exists( currentDirectory , entry['rawFile'] , storeFormat ):
+                entry['level1File'] = os.path.basename( level1Store.level1Path( currentDirectory ,
+                                                                                entry['rawFile'] ,
+                                                                                storeFormat ) )
+            else:
+                entry['level1File'] = None
+            entry['level1SummaryRow'] = level1SummaryRows.get( entry['rawFile'] )
+        siteIndex.saveSiteIndex( currentDirectory , index )
+        return index
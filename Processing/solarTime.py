@@ -195,25 +195,48 @@ class solarTime:
         solarTimeOut = solarTime.localSolarTime( localTime, timeCor )
         
         return solarTimeOut
-    
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
 
 
 
+    def localTimeToSolarTimeArray( longitude , timeZoneDif , localTimes ):
+        '''
+        EXECUTION FUNCTION
+        
+        localTimeToSolarTimeArray()
+        
+        Batch version of localTimeToSolarTime().  Take every local time of a 
+        location at once and convert them to corrected solar time.  The day of 
+        the year, the time correction and the solar times are found as arrays.
+        The time correction is truncated to nanoseconds the same way 
+        pd.Timedelta( minutes = x ) does so the results are identical to 
+        localTimeToSolarTime()
+        
+        @param longitude         -float, longitude of the current site
+        @param timeZoneDif         -int, Number of decimal hours by which local standard 
+                                        time is ahead or behind Universal Time 
+                                        ( + if ahead, - if behind)
+        @param localTimes        -DatetimeIndex or int64 array of nanoseconds, 
+                                        Date and Time (local time) 
+        
+        @return solarTimes       -DatetimeIndex, Location Solar Time of every local time
+        @return hourlySolarTime  -numpy array, decimal hour of the solar time 
+                                                ( hour + minute/60 )
+        '''
+        localTimes = pd.DatetimeIndex( np.asarray( localTimes ).astype( 'datetime64[ns]' ) )
+        
+        lSTM = 15 * timeZoneDif
+        
+        daysInTheYear = localTimes.dayofyear.values.astype( np.float64 )
+        
+        angleB = solarTime.angle_B( daysInTheYear )
+        
+        equationOfTime = solarTime.eoT( angleB )
+        
+        timeCor = solarTime.timeCorrection( equationOfTime , float( longitude ) , float( lSTM ) )
+        
+        # Minutes to nanoseconds ( same truncation as pd.Timedelta )
+        solarTimes = localTimes + pd.to_timedelta( ( timeCor * 60 * 1e9 ).astype( np.int64 ) , unit = 'ns' )
+        
+        hourlySolarTime = solarTimes.hour.values + ( solarTimes.minute.values / 60 )
+        
+        return solarTimes , hourlySolarTime
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+Estimate Level 1 summary metrics at any Latitude and Longitude.
+
+The k closest sites of every point are found with the spatial index of
+closestLatLon and the metrics of those sites are combined with either
+
+    'idw'       Inverse distance weighting, weight = 1 / distance^power
+    'kriging'   Simple kriging with an exponential covariance model, the mean
+                    of every metric is the mean of all sites
+
+The points are processed in vectorized chunks ( numpy arrays ) so a dense
+grid of a region can be estimated in one call.
+
+@author: Derek Holsapple
+"""
+
+import numpy as np
+import pandas as pd
+
+#For XLwings ref
+from Processing.closestLatLon import closestLatLon
+
+
+
+class spatialInterpolation:
+
+    # Interpolation methods
+    methods = ( 'idw' , 'kriging' )
+
+
+
+    def idwWeights( distances , power = 2 ):
+        '''
+        HELPER FUNCTION
+
+        idwWeights()
+
+        Inverse distance weights of the neighbours of every point.  A point on
+        top of a site ( distance 0 ) takes the value of that site.
+
+        @param distances   -numpy array, ( points , k ) distance to the
+                                    neighbours (km)
+        @param power       -float, power of the inverse distance
+
+        @return            -numpy array, ( points , k ) weights, rows sum to 1
+        '''
+        with np.errstate( divide = 'ignore' ):
+            weights = 1.0 / distances ** power
+        exact = distances == 0
+        hasExact = exact.any( axis = 1 )
+        weights[ hasExact ] = exact[ hasExact ].astype( np.float64 )
+        return weights / weights.sum( axis = 1 , keepdims = True )
+
+
+
+    def krigingWeights( distances , neighbourDistances , rangeKm = 500 , nugget = .01 ,
+                        valid = None ):
+        '''
+        HELPER FUNCTION
+
+        krigingWeights()
+
+        Simple kriging weights of the neighbours of every point with the
+        exponential covariance C(h) = exp( -h / range ) ( sill of 1 ).  The
+        nugget is added to the covariance of a site with itself so sites at
+        the same coordinates do not make the system singular.  The systems of
+        every point are solved at once.
+
+        @param distances           -numpy array, ( points , k ) distance from
+                                        the point to the neighbours (km)
+        @param neighbourDistances  -numpy array, ( points , k , k ) distance
+                                        between the neighbours (km)
+        @param rangeKm             -float, range of the covariance model (km)
+        @param nugget              -float, nugget as a fraction of the sill
+        @param valid               -numpy array, ( points , k ) Boolean, True
+                                        for the neighbours used by the
+                                        estimate, None uses every neighbour
+
+        @return                    -numpy array, ( points , k ) weights, 0 for
+                                        the neighbours that are not used
+        '''
+        k = distances.shape[1]
+        identity = np.eye( k )[ None , : , : ]
+        covariance = np.exp( -neighbourDistances / rangeKm ) + nugget * identity
+        target = np.exp( -distances / rangeKm )
+        if valid is not None:
+            # The rows and columns of the unused neighbours are replaced by the
+            #    identity and their target by 0, the other weights are the
+            #    solution of the system of the used neighbours only
+            covariance = np.where( valid[ : , : , None ] & valid[ : , None , : ] , covariance , identity )
+            target = np.where( valid , target , 0 )
+        return np.linalg.solve( covariance , target[ : , : , None ] )[ : , : , 0 ]
+
+
+
+    def interpolateChunk( values , spatialIndex , lat1 , lon1 , k = 8 , method = 'idw' ,
+                          power = 2 , rangeKm = 500 , nugget = .01 ):
+        '''
+        HELPER FUNCTION
+
+        interpolateChunk()
+
+        Estimate metrics at a chunk of points, see interpolateFrame().  The
+        kriging system is solved once for the neighbours of every point and
+        again, for one metric, only at the points where a neighbour has no
+        value of that metric.
+
+        @param values         -numpy array, ( sites , metrics ) summary values
+        @param spatialIndex   -Dictionary, see closestLatLon.createSpatialIndex()
+        @param lat1           -numpy array, Latitudes in Decimal Degrees
+        @param lon1           -numpy array, Longitudes in Decimal Degrees
+
+        @return estimates     -numpy array, ( points , metrics ) estimates
+        '''
+        rows , distances = closestLatLon.nearestSitesBatch( spatialIndex , lat1 , lon1 , k )
+        # ( points , k , metrics ) values of the neighbours
+        neighbours = values[ rows ]
+        # Points without a finite Latitude and Longitude have no neighbours ( row -1 )
+        hasSite = rows >= 0
+        valid = ~np.isnan( neighbours ) & hasSite[ : , : , None ]
+        if method == 'idw':
+            weights = spatialInterpolation.idwWeights( distances , power )[ : , : , None ] * valid
+            # A metric without any valid neighbour is NaN ( 0 / 0 )
+            with np.errstate( invalid = 'ignore' ):
+                return ( weights * np.where( valid , neighbours , 0 ) ).sum( axis = 1 ) / weights.sum( axis = 1 )
+        # Simple kriging of the residuals from the mean of every metric
+        latLon = spatialIndex['latLon']
+        neighbourDistances = closestLatLon.distanceArray( latLon[ rows , 0 ][ : , : , None ] ,
+                                                          latLon[ rows , 1 ][ : , : , None ] ,
+                                                          latLon[ rows , 0 ][ : , None , : ] ,
+                                                          latLon[ rows , 1 ][ : , None , : ] )
+        weights = spatialInterpolation.krigingWeights( distances , neighbourDistances ,
+                                                       rangeKm , nugget , hasSite )
+        mean = np.nanmean( values , axis = 0 )
+        residuals = np.where( valid , neighbours - mean , 0 )
+        estimates = np.empty( ( len( lat1 ) , values.shape[1] ) )
+        for j in range( 0 , values.shape[1] ):
+            metricWeights = weights
+            # Points where a neighbour has no value of the metric
+            partial = ~valid[ : , : , j ].all( axis = 1 )
+            if partial.any():
+                metricWeights = weights.copy()
+                metricWeights[ partial ] = spatialInterpolation.krigingWeights( distances[ partial ] ,
+                                                                                neighbourDistances[ partial ] ,
+                                                                                rangeKm , nugget ,
+                                                                                valid[ partial , : , j ] )
+            estimates[ : , j ] = mean[ j ] + ( metricWeights * residuals[ : , : , j ] ).sum( axis = 1 )
+            # A metric without any valid neighbour is NaN
+            estimates[ ~valid[ : , : , j ].any( axis = 1 ) , j ] = np.nan
+        return estimates
+
+
+
+    def interpolateFrame( summary_df , spatialIndex , lat1 , lon1 , metrics , k = 8 ,
+                          method = 'idw' , power = 2 , rangeKm = 500 , nugget = .01 ,
+                          chunkSize = 20000 ):
+        '''
+        HELPER FUNCTION
+
+        interpolateFrame()
+
+        Estimate metrics at many points from an already loaded summary frame
+        and spatial index.  Neighbours without a value of a metric are left
+        out of the estimate of that metric, a metric without any neighbour 
+        value and a point without a finite Latitude and Longitude are NaN.
+        The points are processed in chunks so the neighbour arrays stay small.
+
+        @param summary_df     -Dataframe, Level 1 summary
+        @param spatialIndex   -Dictionary, see closestLatLon.createSpatialIndex()
+        @param lat1           -array like, Latitudes in Decimal Degrees
+        @param lon1           -array like, Longitudes in Decimal Degrees
+        @param metrics        -List of Strings, summary columns to estimate
+        @param k              -int, number of closest sites used by every point
+        @param method         -String, 'idw' or 'kriging'
+        @param power          -float, power of the inverse distance ( idw )
+        @param rangeKm        -float, range of the covariance model ( kriging )
+        @param nugget         -float, nugget of the covariance model ( kriging )
+        @param chunkSize      -int, number of points processed at once
+
+        @return estimates     -numpy array, ( points , metrics ) estimates
+        '''
+        if method not in spatialInterpolation.methods:
+            raise ValueError( 'Unknown interpolation method: ' + str( method ) )
+        lat1 = np.asarray( lat1 , dtype = np.float64 ).ravel()
+        lon1 = np.asarray( lon1 , dtype = np.float64 ).ravel()
+        values = summary_df.loc[ : , metrics ].astype( float ).values
+        estimates = np.empty( ( len( lat1 ) , len( metrics ) ) )
+        for start in range( 0 , len( lat1 ) , chunkSize ):
+            chunk = slice( start , start + chunkSize )
+            estimates[ chunk ] = spatialInterpolation.interpolateChunk( values , spatialIndex ,
+                                                                        lat1[ chunk ] , lon1[ chunk ] ,
+                                                                        k , method , power ,
+                                                                        rangeKm , nugget )
+        return estimates
+
+
+
+    def interpolate( currentDirectory , lat1 , lon1 , metrics , k = 8 , method = 'idw' ,
+                     power = 2 , rangeKm = 500 , nugget = .01 ):
+        '''
+        EXECUTION FUNCTION
+
+        interpolate()
+
+        Estimate Level 1 summary metrics at many points.  The summary and the
+        spatial index are loaded once, see interpolateFrame() for the
+        arguments.
+
+        @param currentDirectory  -String, of current working directory
+        @param lat1              -array like, Latitudes in Decimal Degrees
+        @param lon1              -array like, Longitudes in Decimal Degrees
+        @param metrics           -List of Strings, summary columns to estimate
+
+        @return estimate_df      -Dataframe, 'Latitude', 'Longitude' and the
+                                        estimate of every metric at every point
+        '''
+        summary_df = pd.read_pickle( closestLatLon.summaryPath( currentDirectory ) )
+        spatialIndex = closestLatLon.loadSpatialIndex( currentDirectory )
+        estimates = spatialInterpolation.interpolateFrame( summary_df , spatialIndex ,
+                                                           lat1 , lon1 , metrics , k ,
+                                                           method , power , rangeKm , nugget )
+        estimate_df = pd.DataFrame( estimates , columns = metrics )
+        estimate_df.insert( 0 , 'Latitude' , np.asarray( lat1 , dtype = np.float64 ).ravel() )
+        estimate_df.insert( 1 , 'Longitude' , np.asarray( lon1 , dtype = np.float64 ).ravel() )
+        return estimate_df
+
+
+
+    def interpolateGrid( currentDirectory , metrics , resolution = 1.0 ,
+                         latRange = ( -90 , 90 ) , lonRange = ( -180 , 180 ) ,
+                         k = 8 , method = 'idw' , power = 2 , rangeKm = 500 , nugget = .01 ,
+                         chunkSize = 20000 ):
+        '''
+        EXECUTION FUNCTION
+
+        interpolateGrid()
+
+        Estimate Level 1 summary metrics at the centers of the cells of a
+        regular Lat/Lon grid
+
+        @param currentDirectory  -String, of current working directory
+        @param metrics           -List of Strings, summary columns to estimate
+        @param resolution        -float, size of a grid cell in Decimal Degrees
+        @param latRange          -tuple, ( south , north ) edges of the grid
+        @param lonRange          -tuple, ( west , east ) edges of the grid
+        @param chunkSize         -int, number of cells processed at once, see
+                                        interpolateFrame()
+
+        @return lats             -numpy array, latitude of the cell centers
+                                        ( south to north )
+        @return lons             -numpy array, longitude of the cell centers
+                                        ( west to east )
+        @return grids            -Dictionary, metric : ( lats , lons ) array
+        '''
+        lats = np.arange( latRange[0] + resolution / 2 , latRange[1] , resolution )
+        lons = np.arange( lonRange[0] + resolution / 2 , lonRange[1] , resolution )
+        gridLat , gridLon = np.meshgrid( lats , lons , indexing = 'ij' )
+        summary_df = pd.read_pickle( closestLatLon.summaryPath( currentDirectory ) )
+        spatialIndex = closestLatLon.loadSpatialIndex( currentDirectory )
+        estimates = spatialInterpolation.interpolateFrame( summary_df , spatialIndex ,
+                                                           gridLat.ravel() , gridLon.ravel() ,
+                                                           metrics , k , method , power ,
+                                                           rangeKm , nugget , chunkSize )
+        grids = { metrics[i] : estimates[ : , i ].reshape( gridLat.shape )
+                  for i in range( 0 , len( metrics ) ) }
+        return lats , lons , grids
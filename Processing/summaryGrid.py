@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Gridded raster layers of the Level 1 summary metrics.
+
+Every metric of the Level 1 summary is rasterized onto a global Lat/Lon grid
+of a chosen resolution so the world maps can draw one image instead of a
+circle per site.  A cell takes the value of
+
+    'nearest'   the closest site
+    'idw'       inverse distance weighting of the closest sites
+    'kriging'   simple kriging of the closest sites
+
+see spatialInterpolation for the last two.  The grids of one method and
+resolution are stored together as a compressed .npz file in
+\Pandas_Pickle_DataFrames\Pickle_Level1_Grids
+
+    'lats'          latitude of the cell centers ( south to north )
+    'lons'          longitude of the cell centers ( west to east )
+    'metrics'       summary column of every grid
+    'grids'         ( metrics , lats , lons ) float32, NaN where no value
+    'siteDistance'  ( lats , lons ) float32, distance of every cell to the
+                        closest site (km), cells far from every site ( open
+                        ocean ) are left empty when a grid is loaded
+    'summaryMtime'  modified time of the summary the grids were made from
+
+@author: Derek Holsapple
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+#For XLwings ref
+from Processing.closestLatLon import closestLatLon
+from Processing.spatialInterpolation import spatialInterpolation
+from Processing.rawDataImport import rawDataImport
+
+
+
+class summaryGrid:
+
+    # Methods used to fill the cells of a grid
+    methods = ( 'nearest' , 'idw' , 'kriging' )
+    # Cells farther than this from every site (km) are left empty on the maps
+    mapMaxDistance = 300
+
+
+
+    def gridPath( currentDirectory , resolution = 0.5 , method = 'nearest' ):
+        '''
+        HELPER FUNCTION
+
+        gridPath()
+
+        @param currentDirectory  -String, of current working directory
+        @param resolution        -float, size of a grid cell in Decimal Degrees
+        @param method            -String, 'nearest', 'idw' or 'kriging'
+
+        @return                  -String, path of the compressed grids
+        '''
+        return currentDirectory + '\\Pandas_Pickle_DataFrames\\Pickle_Level1_Grids\\' + \
+               'summaryGrid_' + method + '_' + '{:g}'.format( resolution ) + '.npz'
+
+
+
+    def summaryMetrics( summary_df ):
+        '''
+        HELPER FUNCTION
+
+        summaryMetrics()
+
+        Numeric columns of the Level 1 summary that are not site information
+
+        @param summary_df   -Dataframe, Level 1 summary
+
+        @return             -String List, summary metrics that can be gridded
+        '''
+        return [ column for column in summary_df.columns
+                 if column not in rawDataImport.firstRowColumns and
+                 np.issubdtype( summary_df[column].dtype , np.number ) ]
+
+
+
+    def createSummaryGrids( currentDirectory , resolution = 0.5 , method = 'nearest' ,
+                            metrics = None , k = 8 , chunkSize = 20000 ):
+        '''
+        EXECUTION FUNCTION
+
+        createSummaryGrids()
+
+        Rasterize the Level 1 summary metrics onto a global grid and store the
+        grids with the distance of every cell to the closest site.  Every
+        cell is filled, the cells far from the sites are left empty when the
+        grid is loaded ( see loadSummaryGrid() ).  The cells are processed in
+        chunks so the neighbour values of the interpolation stay small.  Must
+        be run after finalOutputFrame.level_1_df_toPickle()
+
+        @param currentDirectory  -String, of current working directory
+        @param resolution        -float, size of a grid cell in Decimal Degrees
+        @param method            -String, 'nearest', 'idw' or 'kriging'
+        @param metrics           -String List, summary columns to grid, None
+                                        grids every metric of the summary
+        @param k                 -int, number of closest sites of every cell
+                                        ( 'idw' and 'kriging' )
+        @param chunkSize         -int, number of cells processed at once
+
+        @return                  -String, path of the stored grids
+        '''
+        if method not in summaryGrid.methods:
+            raise ValueError( 'Unknown grid method: ' + str( method ) )
+        summary_df = pd.read_pickle( closestLatLon.summaryPath( currentDirectory ) )
+        spatialIndex = closestLatLon.loadSpatialIndex( currentDirectory )
+        if metrics is None:
+            metrics = summaryGrid.summaryMetrics( summary_df )
+        values = summary_df.loc[ : , metrics ].astype( float ).values
+        lats = np.arange( -90 + resolution / 2 , 90 , resolution )
+        lons = np.arange( -180 + resolution / 2 , 180 , resolution )
+        gridLat , gridLon = np.meshgrid( lats , lons , indexing = 'ij' )
+        gridLat = gridLat.ravel()
+        gridLon = gridLon.ravel()
+        cells = np.empty( ( len( gridLat ) , len( metrics ) ) , dtype = np.float32 )
+        siteDistance = np.empty( len( gridLat ) , dtype = np.float32 )
+        for start in range( 0 , len( gridLat ) , chunkSize ):
+            chunk = slice( start , start + chunkSize )
+            rows , distances = closestLatLon.nearestSitesBatch( spatialIndex ,
+                                                                gridLat[ chunk ] ,
+                                                                gridLon[ chunk ] , 1 )
+            siteDistance[ chunk ] = distances[ : , 0 ]
+            if method == 'nearest':
+                cells[ chunk ] = values[ rows[ : , 0 ] ]
+            else:
+                cells[ chunk ] = spatialInterpolation.interpolateFrame( summary_df , spatialIndex ,
+                                                                        gridLat[ chunk ] ,
+                                                                        gridLon[ chunk ] ,
+                                                                        metrics , k , method )
+        grids = cells.T.reshape( len( metrics ) , len( lats ) , len( lons ) )
+        if not os.path.exists( currentDirectory + '\\Pandas_Pickle_DataFrames\\Pickle_Level1_Grids' ):
+            os.makedirs( currentDirectory + '\\Pandas_Pickle_DataFrames\\Pickle_Level1_Grids' )
+        gridFile = summaryGrid.gridPath( currentDirectory , resolution , method )
+        np.savez_compressed( gridFile ,
+                             lats = lats ,
+                             lons = lons ,
+                             metrics = np.array( metrics ) ,
+                             grids = grids ,
+                             siteDistance = siteDistance.reshape( len( lats ) , len( lons ) ) ,
+                             summaryMtime = os.path.getmtime( closestLatLon.summaryPath( currentDirectory ) ) )
+        return gridFile
+
+
+
+    def loadSummaryGrid( currentDirectory , metric , resolution = 0.5 , method = 'nearest' ,
+                         maxDistance = None ):
+        '''
+        EXECUTION FUNCTION
+
+        loadSummaryGrid()
+
+        Load the grid of one metric.  The grids are created again when they do
+        not exist, do not hold the metric or are older than the Level 1
+        summary.
+
+        @param currentDirectory  -String, of current working directory
+        @param metric            -String, summary column
+        @param resolution        -float, size of a grid cell in Decimal Degrees
+        @param method            -String, 'nearest', 'idw' or 'kriging'
+        @param maxDistance       -float, cells farther than this from every
+                                        site are left empty ( NaN ) (km), None
+                                        keeps every cell
+
+        @return lats             -numpy array, latitude of the cell centers
+        @return lons             -numpy array, longitude of the cell centers
+        @return grid             -numpy array, ( lats , lons ) values of the metric
+        '''
+        gridFile = summaryGrid.gridPath( currentDirectory , resolution , method )
+        summaryMtime = os.path.getmtime( closestLatLon.summaryPath( currentDirectory ) )
+        current = False
+        if os.path.isfile( gridFile ):
+            with np.load( gridFile ) as stored:
+                current = 'siteDistance' in stored.files and \
+                          float( stored['summaryMtime'] ) == summaryMtime and \
+                          metric in stored['metrics'].tolist()
+        if not current:
+            summaryGrid.createSummaryGrids( currentDirectory , resolution , method )
+        with np.load( gridFile ) as stored:
+            grid = stored['grids'][ stored['metrics'].tolist().index( metric ) ]
+            if maxDistance is not None:
+                grid = np.where( stored['siteDistance'] > maxDistance , np.nan , grid )
+            return stored['lats'] , stored['lons'] , grid
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Contains summary statistics of the hourly data of a site.
+
+The statistics are found for many columns at once from a 2D array
+( hours , columns ) instead of sorting a dataframe once per column.
+
+@author: Derek Holsapple
+"""
+
+import numpy as np
+
+
+
+class summaryStatistics:
+
+
+
+    def toColumns( values ):
+        '''
+        HELPER FUNCTION
+
+        toColumns()
+
+        Copy the data into a 2D float array of ( hours , columns ).  A single
+        column ( 1D array or Series ) becomes one column.
+
+        @param values     -array like, hourly data of one or more columns
+
+        @return           -2D numpy array, ( hours , columns )
+        '''
+        values = np.array( values , dtype = np.float64 )
+        if values.ndim == 1:
+            values = values.reshape( -1 , 1 )
+        return values
+
+
+
+    def topMeans( values , k ):
+        '''
+        HELPER FUNCTION
+
+        topMeans()
+
+        Find the average of the k largest values of every column.  Same result
+        as df.nlargest( k , column )[column].mean() for each column but uses a
+        partial sort ( np.partition ) of the array instead of sorting the frame.
+        NaN values are ignored the same way nlargest() ignores them.
+
+        @param values     -2D numpy array, ( hours , columns )
+        @param k          -int, number of largest values to average
+
+        @return           -numpy array, average of the k largest values of each
+                                column ( NaN if there are no values to average )
+        '''
+        values = summaryStatistics.toColumns( values )
+        if values.shape[0] == 0 or k <= 0:
+            return np.full( values.shape[1] , np.nan )
+        k = min( k , values.shape[0] )
+        # NaN values are sorted to the bottom so they are never picked
+        values[ np.isnan( values ) ] = -np.inf
+        top = np.partition( values , values.shape[0] - k , axis = 0 )[ values.shape[0] - k: ]
+        # Columns with less than k values only average the values found
+        valid = np.isfinite( top )
+        count = valid.sum( axis = 0 )
+        total = np.where( valid , top , 0.0 ).sum( axis = 0 )
+        with np.errstate( invalid = 'ignore' , divide = 'ignore' ):
+            return np.where( count > 0 , total / count , np.nan )
+
+
+
+    def topPercentMeans( values , percent = .02 ):
+        '''
+        HELPER FUNCTION
+
+        topPercentMeans()
+
+        Find the average of the top percent of every column.  For 8760 hours
+        and the default of 2% the highest 175 values are averaged
+        ( the 98th percentile average )
+
+        @param values     -2D numpy array, ( hours , columns )
+        @param percent    -float, fraction of the hours to average
+
+        @return           -numpy array, average of the top percent of each column
+        '''
+        values = summaryStatistics.toColumns( values )
+        return summaryStatistics.topMeans( values , int( values.shape[0] * percent ) )
+
+
+
+    def percentiles( values , q = 98 ):
+        '''
+        HELPER FUNCTION
+
+        percentiles()
+
+        Find the true percentile of every column ( linear interpolation
+        between hours ), NaN values are ignored.
+
+        @param values     -2D numpy array, ( hours , columns )
+        @param q          -float, percentile between 0 and 100
+
+        @return           -numpy array, q-th percentile of each column
+        '''
+        values = summaryStatistics.toColumns( values )
+        return np.nanpercentile( values , q , axis = 0 )
+
+
+
+    def hoursAbove( values , threshold ):
+        '''
+        HELPER FUNCTION
+
+        hoursAbove()
+
+        Count the number of hours every column is above a threshold
+        ( exceedance ).
+
+        @param values     -2D numpy array, ( hours , columns )
+        @param threshold  -float, value the hours must be greater than
+
+        @return           -numpy array, number of hours above the threshold
+                                for each column
+        '''
+        values = summaryStatistics.toColumns( values )
+        with np.errstate( invalid = 'ignore' ):
+            return np.count_nonzero( values > threshold , axis = 0 )